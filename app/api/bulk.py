@@ -0,0 +1,132 @@
+from __future__ import annotations
+import json
+from typing import Any, AsyncIterator
+from fastapi import Request
+from ..core.config import settings
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+# Longest text a decode error can point back over when the element is only
+# cut short by the chunk boundary: "-Infinit", "1.5e-", "\u00e"
+_TRUNCATED_TAIL = 8
+
+
+class BulkParseError(Exception):
+    pass
+
+
+class LineError:
+    """Placeholder yielded for an NDJSON line that is not valid JSON."""
+
+    def __init__(self, msg: str) -> None:
+        self.msg = msg
+
+
+async def iter_json_items(request: Request) -> AsyncIterator[Any]:
+    """Yield items from an NDJSON or JSON-array body as it streams in.
+
+    The body is never buffered as a whole: NDJSON is split on newlines and a
+    JSON array is decoded element by element with ``raw_decode``.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_TYPES:
+        async for item in _iter_ndjson(request.stream()):
+            yield item
+    else:
+        async for item in _iter_json_array(request.stream()):
+            yield item
+
+
+async def _iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    buf = b""
+    async for chunk in chunks:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _loads_line(line)
+    if buf.strip():
+        yield _loads_line(buf)
+
+
+def _loads_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        return LineError(str(exc))
+
+
+async def _iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    decoder = json.JSONDecoder()
+    buf = ""
+    pending = b""  # incomplete UTF-8 sequence from the previous chunk
+    state = "start"  # start -> item -> sep -> ... -> end
+    async for chunk in chunks:
+        data = pending + chunk
+        cut = _utf8_boundary(data)
+        try:
+            buf += data[:cut].decode("utf-8")
+        except UnicodeDecodeError:
+            raise BulkParseError("invalid_utf8")
+        pending = data[cut:]
+        pos = 0
+        while True:
+            pos = _skip_ws(buf, pos)
+            if pos >= len(buf):
+                break
+            if state == "start":
+                if buf[pos] != "[":
+                    raise BulkParseError("expected_json_array")
+                pos += 1
+                state = "first"
+            elif state in ("first", "item"):
+                if state == "first" and buf[pos] == "]":
+                    state, pos = "end", pos + 1
+                    continue
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError as exc:
+                    if not _truncated(buf, exc):
+                        raise BulkParseError("invalid_json_array")
+                    if len(buf) - pos > settings.BULK_MAX_ITEM_CHARS:
+                        raise BulkParseError("item_too_large")
+                    break  # element not complete yet; wait for more data
+                if isinstance(item, (int, float)) and (end == len(buf) or buf[end] not in ",] \t\r\n"):
+                    break  # a number may continue in the next chunk ("1." -> "1.5")
+                yield item
+                pos, state = end, "sep"
+            elif state == "sep":
+                if buf[pos] == ",":
+                    pos, state = pos + 1, "item"
+                elif buf[pos] == "]":
+                    pos, state = pos + 1, "end"
+                else:
+                    raise BulkParseError("invalid_json_array")
+            else:
+                raise BulkParseError("trailing_data")
+        buf = buf[pos:]
+    if state != "end" or buf.strip() or pending:
+        raise BulkParseError("invalid_json_array")
+
+
+def _truncated(buf: str, exc: json.JSONDecodeError) -> bool:
+    """Whether the error may go away once more of the body arrives."""
+    return exc.msg.startswith("Unterminated string") or len(buf) - exc.pos <= _TRUNCATED_TAIL
+
+
+def _skip_ws(buf: str, pos: int) -> int:
+    while pos < len(buf) and buf[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def _utf8_boundary(data: bytes) -> int:
+    """Length of the longest prefix of ``data`` that ends on a UTF-8 boundary."""
+    for back in range(1, min(4, len(data)) + 1):
+        b = data[-back]
+        if b & 0xC0 == 0x80:
+            continue  # continuation byte
+        if b & 0x80 == 0:
+            return len(data)
+        need = 2 if b & 0xE0 == 0xC0 else 3 if b & 0xF0 == 0xE0 else 4
+        return len(data) if back >= need else len(data) - back
+    return len(data)
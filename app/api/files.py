@@ -0,0 +1,65 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+MEDIA_TYPES = {".wav": "audio/wav", ".mp3": "audio/mpeg"}
+
+
+async def file_response(
+    request: Request,
+    path: Path,
+    *,
+    filename: str,
+    content_hash: str | None = None,
+) -> Response:
+    """Serve ``path`` with validators, conditional requests and byte ranges.
+
+    Content-addressed files use their sha256 as a strong ETag and never
+    change, so clients may cache them for good. ``If-None-Match`` /
+    ``If-Modified-Since`` are answered with 304 here; ``Range``/``If-Range``
+    (206/416) and the zero-copy send are handled by ``FileResponse``.
+    Raises ``FileNotFoundError`` when the file is missing.
+    """
+    st = await asyncio.to_thread(path.stat)
+    if content_hash:
+        etag = f'"{content_hash}"'
+        cache_control = "private, max-age=31536000, immutable"
+    else:
+        base = f"{st.st_mtime_ns}-{st.st_size}".encode()
+        etag = f'"{hashlib.md5(base, usedforsecurity=False).hexdigest()}"'
+        cache_control = "private, no-cache"
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(st.st_mtime, usegmt=True),
+        "cache-control": cache_control,
+        "accept-ranges": "bytes",
+    }
+    if _not_modified(request, etag, int(st.st_mtime)):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        path,
+        stat_result=st,
+        headers=headers,
+        media_type=MEDIA_TYPES.get(path.suffix.lower()),
+        filename=filename,
+        content_disposition_type="inline",
+    )
+
+
+def _not_modified(request: Request, etag: str, mtime: int) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison (RFC 9110 13.1.2); If-Modified-Since is then ignored
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return mtime <= int(parsedate_to_datetime(if_modified_since).timestamp())
+        except (TypeError, ValueError):
+            return False
+    return False
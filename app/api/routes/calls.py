@@ -1,11 +1,24 @@
 from __future__ import annotations
+import asyncio
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import RedirectResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from ...schemas.call import CreateCall, CallOut, CallsPage
-from ...services.calls import create_call, get_call, search_calls
-from ...services.storage import make_presigned_url, PresignNotConfigured
-from ...services.recordings import get_recording_by_call_id
+from ...core.config import settings
+from ...schemas.call import (
+    CreateCall, CallOut, CallsPage, BulkItemResult, BulkResult, DownloadUrlsIn, DownloadUrlsOut,
+)
+from ...services.calls import (
+    bulk_create_calls, create_call, get_call_cached, search_calls, InvalidCursor, TotalMode,
+)
+from ..bulk import BulkParseError, LineError, iter_json_items
+from ..files import file_response
+from ...services.storage import (
+    get_storage, make_presigned_url, presigned_url, resolve_key, LocalStorage, PresignNotConfigured,
+)
+from ...services.recordings import get_recording_by_call_id, get_recording_keys
 from ...api.deps import get_db
 
 router = APIRouter(prefix="/calls", tags=["calls"])
@@ -17,9 +30,81 @@ async def create_call_endpoint(payload: CreateCall, db: AsyncSession = Depends(g
     return _to_call_out(data)
 
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_calls_endpoint(request: Request, db: AsyncSession = Depends(get_db)) -> BulkResult:
+    """Create many calls from an NDJSON (application/x-ndjson) or JSON array body.
+
+    The body is consumed as a stream and written in batches of
+    ``BULK_BATCH_SIZE``; each input item gets a result with its index.
+    """
+    results: list[BulkItemResult] = []
+    batch: list[dict] = []
+    batch_index: list[int] = []
+
+    async def flush() -> None:
+        rows = await bulk_create_calls(db, batch)
+        results.extend(BulkItemResult(index=i, id=r["id"]) for i, r in zip(batch_index, rows))
+        batch.clear()
+        batch_index.clear()
+
+    index = 0
+    try:
+        async for item in iter_json_items(request):
+            if isinstance(item, LineError):
+                results.append(BulkItemResult(index=index, error=f"invalid_json: {item.msg}"))
+            else:
+                try:
+                    payload = CreateCall.model_validate(item)
+                except ValidationError as exc:
+                    results.append(BulkItemResult(index=index, error=_validation_message(exc)))
+                else:
+                    batch.append(payload.model_dump())
+                    batch_index.append(index)
+                    if len(batch) >= settings.BULK_BATCH_SIZE:
+                        await flush()
+            index += 1
+    except BulkParseError as exc:
+        # Batches already flushed stay committed; report where parsing stopped
+        if not results and not batch:
+            raise HTTPException(status_code=400, detail=str(exc))
+        results.append(BulkItemResult(index=index, error=str(exc)))
+    if batch:
+        await flush()
+
+    results.sort(key=lambda r: r.index)
+    failed = sum(1 for r in results if r.error is not None)
+    return BulkResult(created=len(results) - failed, failed=failed, items=results)
+
+
+@router.post("/downloads", response_model=DownloadUrlsOut)
+async def download_urls(payload: DownloadUrlsIn, request: Request, db: AsyncSession = Depends(get_db)):
+    """Download URLs for many calls at once (export jobs); one DB query, cached presigns."""
+    if len(payload.call_ids) > settings.PRESIGN_BATCH_MAX:
+        raise HTTPException(status_code=422, detail="too_many_call_ids")
+    keys = await get_recording_keys(db, payload.call_ids)
+    try:
+        # Cached URLs may be part way through their lifetime: report what is left
+        signed = await asyncio.to_thread(lambda: {cid: presigned_url(k) for cid, k in keys.items()})
+        lifetimes = [left for _, left in signed.values()]
+        expires_in = min(lifetimes, default=settings.PRESIGN_EXPIRES_SEC)
+    except PresignNotConfigured:
+        if not settings.LOCAL_DOWNLOADS:
+            raise HTTPException(status_code=501, detail="presign_not_configured")
+        local = {cid: str(request.url_for("stream_call_recording", call_id=cid)) for cid in keys}
+        signed = {cid: (url, None) for cid, url in local.items()}
+        expires_in = None
+    items = [
+        {"call_id": cid, "url": signed[cid][0], "expires_in": signed[cid][1]}
+        if cid in signed
+        else {"call_id": cid, "error": "recording_not_found"}
+        for cid in payload.call_ids
+    ]
+    return {"expires_in": expires_in, "items": items}
+
+
 @router.get("/{call_id}", response_model=CallOut)
 async def get_call_endpoint(call_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> CallOut:
-    data = await get_call(db, call_id)
+    data = await get_call_cached(db, call_id)
     if not data:
         raise HTTPException(status_code=404, detail="call_not_found")
     return _to_call_out(data)
@@ -30,15 +115,32 @@ async def search_calls_endpoint(
     query: str = Query(min_length=2),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="next_cursor from the previous page; overrides offset"),
+    total: TotalMode = Query(TotalMode.exact),
+    started_from: datetime | None = Query(None, description="started_at >= this"),
+    started_to: datetime | None = Query(None, description="started_at < this"),
     db: AsyncSession = Depends(get_db),
 ) -> CallsPage:
-    total, items = await search_calls(db, query=query, limit=limit, offset=offset)
-    return CallsPage(total=total, items=[_to_call_out(it) for it in items])
+    """Phone search; a started_at window only scans the monthly partitions it covers."""
+    try:
+        count, items, next_cursor = await search_calls(
+            db,
+            query=query,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            total_mode=total,
+            started_from=started_from,
+            started_to=started_to,
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="invalid_cursor")
+    return CallsPage(total=count, items=[_to_call_out(it) for it in items], next_cursor=next_cursor)
 
 
 @router.get("/{call_id}/download")
-async def download_call_recording(call_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    data = await get_call(db, call_id)
+async def download_call_recording(call_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_db)):
+    data = await get_call_cached(db, call_id)
     if not data:
         raise HTTPException(status_code=404, detail="call_not_found")
     rec = await get_recording_by_call_id(db, call_id=call_id)
@@ -47,12 +149,47 @@ async def download_call_recording(call_id: uuid.UUID, db: AsyncSession = Depends
     try:
         url = make_presigned_url(rec.filename)
     except PresignNotConfigured:
-        raise HTTPException(status_code=501, detail="presign_not_configured")
+        if not settings.LOCAL_DOWNLOADS:
+            raise HTTPException(status_code=501, detail="presign_not_configured")
+        # No object storage: point at the local streaming endpoint instead
+        url = str(request.url_for("stream_call_recording", call_id=call_id))
     return {"url": url}
 
 
+@router.api_route("/{call_id}/audio", methods=["GET", "HEAD"], name="stream_call_recording")
+async def stream_call_recording(call_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_db)):
+    """Recording bytes from RECORDINGS_DIR with Range (seeking) and ETag/304 support.
+
+    With the S3 backend this redirects to a presigned URL instead.
+    """
+    if not settings.LOCAL_DOWNLOADS:
+        raise HTTPException(status_code=404, detail="local_downloads_disabled")
+    rec = await get_recording_by_call_id(db, call_id=call_id)
+    if not rec:
+        raise HTTPException(status_code=404, detail="recording_not_found")
+    key, content_hash = rec.filename, rec.content_hash
+    # Give the pooled connection back before a possibly long transfer
+    await db.close()
+    if not isinstance(get_storage(), LocalStorage):
+        # Objects live in S3: let the client fetch (and seek) them there
+        return RedirectResponse(make_presigned_url(key), status_code=307)
+    path = resolve_key(key)
+    try:
+        return await file_response(
+            request, path, filename=f"{call_id}{path.suffix.lower()}", content_hash=content_hash
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="file_not_found")
+
+
 # mappers
 
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'item'}: {err['msg']}" for err in exc.errors()
+    )
+
+
 def _to_call_out(data: dict) -> CallOut:
     status = data.get("status")
     status_str = status.value if hasattr(status, "value") else str(status)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import json
+import time
+import uuid
+from typing import AsyncIterator
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from ...core.config import settings
+from ...core.db import SessionLocal
+from ...core.redis import redis_available
+from ...models import CallStatus
+from ...services.calls import get_call
+from ...services.events import StatusSubscription
+
+# Registered before the calls router so /calls/events is not taken for a call id
+router = APIRouter(prefix="/calls", tags=["events"])
+
+TERMINAL = {CallStatus.ready.value}
+
+
+@router.get("/events")
+async def calls_status_events(
+    ids: list[uuid.UUID] = Query(..., description="Call ids to follow"),
+) -> StreamingResponse:
+    """Server-sent events with status transitions of the given calls.
+
+    The current status of every call is sent first; the stream ends once all
+    of them are ``ready``.
+    """
+    if len(ids) > settings.EVENTS_MAX_CALLS:
+        raise HTTPException(status_code=422, detail="too_many_calls")
+    return await _open_stream(list(dict.fromkeys(ids)))
+
+
+@router.get("/{call_id}/events")
+async def call_status_events(call_id: uuid.UUID) -> StreamingResponse:
+    return await _open_stream([call_id])
+
+
+async def _open_stream(call_ids: list[uuid.UUID]) -> StreamingResponse:
+    if not redis_available():
+        raise HTTPException(status_code=501, detail="events_not_configured")
+    sub = StatusSubscription(call_ids)
+    await sub.__aenter__()
+    try:
+        # Snapshot after subscribing (and bypassing the cache) so no transition is missed
+        # Own short-lived session: a request-scoped one would hold a pooled
+        # connection for as long as the stream stays open
+        current: dict[str, str] = {}
+        async with SessionLocal() as db:
+            for call_id in call_ids:
+                data = await get_call(db, call_id)
+                if data is None:
+                    raise HTTPException(status_code=404, detail="call_not_found")
+                status = data["status"]
+                current[str(call_id)] = status.value if hasattr(status, "value") else str(status)
+    except BaseException:
+        await sub.__aexit__(None, None, None)
+        raise
+    return StreamingResponse(
+        _events(sub, current),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _events(sub: StatusSubscription, current: dict[str, str]) -> AsyncIterator[str]:
+    try:
+        for call_id, status in current.items():
+            yield _sse({"call_id": call_id, "status": status})
+        last_sent = time.monotonic()
+        while not all(s in TERMINAL for s in current.values()):
+            event = await sub.next_event(timeout=settings.EVENTS_HEARTBEAT_SEC)
+            if event is None:
+                # Comment line keeps proxies from closing an idle stream
+                if time.monotonic() - last_sent >= settings.EVENTS_HEARTBEAT_SEC:
+                    last_sent = time.monotonic()
+                    yield ": keepalive\n\n"
+                continue
+            if current.get(event["call_id"]) == event["status"]:
+                continue
+            current[event["call_id"]] = event["status"]
+            last_sent = time.monotonic()
+            yield _sse(event)
+    finally:
+        await sub.__aexit__(None, None, None)
+
+
+def _sse(data: dict) -> str:
+    return f"event: status\ndata: {json.dumps(data)}\n\n"
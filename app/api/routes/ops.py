@@ -0,0 +1,21 @@
+from __future__ import annotations
+from fastapi import APIRouter, HTTPException, Response
+from ...core.config import settings
+from ...core.metrics import render_metrics
+from ...services.cache import call_cache
+
+router = APIRouter(tags=["ops"])
+
+
+@router.get("/cache/stats")
+async def cache_stats() -> dict:
+    return {"calls": call_cache.snapshot()}
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus exposition (route latency, DB, cache; task/audio metrics in multiprocess mode)."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="metrics_disabled")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
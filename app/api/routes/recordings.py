@@ -1,30 +1,260 @@
 from __future__ import annotations
+import asyncio
+import re
 import uuid
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from enum import StrEnum
+from typing import BinaryIO, Optional
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from ...api.deps import get_db
-from ...services.storage import save_file, StorageError
-from ...services.recordings import create_recording, RecordingAlreadyExists
-from ...core.celery_app import celery_app
+from ...services.storage import (
+    ALLOWED_EXT,
+    allowed_extension,
+    get_storage,
+    S3Storage,
+    StorageError,
+    UploadTooLarge,
+)
+from ...services import peaks
+from ...services.probe import probe, ProbeError
+from ...services.calls import get_call_cached
+from ...services.recordings import (
+    CallNotFound,
+    create_recording,
+    get_recording_by_call_id,
+    get_silence_marks,
+    mark_ready,
+    RecordingAlreadyExists,
+    RecordingNotFound,
+)
+from ...services.analysis_cache import get_cached_analysis
+from ...services.audio import analysis_version
+from ...services.outbox import outbox_message
+from ...services.routing import Priority, task_options
+from ...schemas.call import CompleteUploadIn, PeaksOut, SilenceMarksOut, UploadUrlOut
+from ...core.config import settings
 
 router = APIRouter(prefix="/calls", tags=["recordings"])
 
+# Keys handed out for presigned PUTs: <prefix><call_id>/<uuid4 hex><ext>
+DIRECT_UPLOAD_PREFIX = "incoming/"
+_DIRECT_UPLOAD_NAME = re.compile(r"[0-9a-f]{32}(\.[a-z0-9]+)")
+
+
+class PayloadFormat(StrEnum):
+    json = "json"
+    binary = "binary"  # the stored packed bytes, see the endpoint docs
+
 
 @router.post("/{call_id}/recording", status_code=status.HTTP_202_ACCEPTED)
-async def upload_recording(call_id: uuid.UUID, file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
-    # 1) Save file into volume
+async def upload_recording(
+    call_id: uuid.UUID,
+    file: UploadFile = File(...),
+    priority: Priority = Query(Priority.normal, description="urgent jumps ahead in its queue"),
+    db: AsyncSession = Depends(get_db),
+):
+    # Nothing is stored for unknown calls (create_recording re-checks atomically)
+    if await get_call_cached(db, call_id) is None:
+        raise HTTPException(status_code=404, detail="call_not_found")
+
+    # 1) Stream file into storage (off the event loop; local: content store, S3: spool)
+    storage = get_storage()
+    try:
+        stored = await storage.stage_upload(file.filename or "", file)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="file_too_large")
+    except StorageError:
+        raise HTTPException(status_code=422, detail="unsupported_extension")
+
+    # Reject non-audio payloads early (header-only probe, no decoding)
+    try:
+        info = await asyncio.to_thread(probe, stored.path, decode_fallback=False)
+    except ProbeError:
+        await storage.discard(stored)
+        raise HTTPException(status_code=422, detail="invalid_audio")
+    await storage.commit(stored)
+
+    cached = await get_cached_analysis(db, content_hash=stored.sha256, version=analysis_version())
+
+    # 2) Create DB row, set call status to processing and (unless the result
+    #    is cached) queue the task in the outbox, all in one transaction;
+    #    the task goes to the short/long queue picked from the probe
+    options = task_options(info, stored.size, priority)
+    dispatch = None
+    if cached is None:
+        args = [str(call_id), stored.key, stored.sha256]
+        dispatch = outbox_message("tasks.process_recording", args, **options)
+    try:
+        rec = await create_recording(
+            db, call_id=call_id, filename=stored.key, content_hash=stored.sha256, dispatch=dispatch
+        )
+    except RecordingAlreadyExists:
+        raise HTTPException(status_code=409, detail="recording_already_exists")
+    except CallNotFound:
+        raise HTTPException(status_code=404, detail="call_not_found")
+
+    out = {"recording_id": str(rec["id"]), "filename": rec["filename"], "sha256": stored.sha256}
+
+    # 3a) Identical audio was analysed before: reuse the result, no CPU work
+    if cached is not None:
+        await mark_ready(db, call_id=call_id, **cached)
+        return {**out, "status": "ready"}
+
+    # 3b) The outbox relay publishes the task (see services/outbox.py)
+    return {**out, "status": "processing", "queue": options["queue"]}
+
+
+@router.post("/{call_id}/recording/upload-url", response_model=UploadUrlOut)
+async def create_upload_url(
+    call_id: uuid.UUID,
+    filename: str = Query(..., description="e.g. call.wav"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Presigned PUT for uploading straight to object storage (S3 backend only)."""
+    storage = get_storage()
+    if not isinstance(storage, S3Storage):
+        raise HTTPException(status_code=501, detail="direct_upload_not_supported")
     try:
-        dst = save_file(call_id, file.filename, file.file)
+        ext = allowed_extension(filename)
     except StorageError:
         raise HTTPException(status_code=422, detail="unsupported_extension")
+    if await get_call_cached(db, call_id) is None:
+        raise HTTPException(status_code=404, detail="call_not_found")
+    key = f"{DIRECT_UPLOAD_PREFIX}{call_id}/{uuid.uuid4().hex}{ext}"
+    url = await asyncio.to_thread(storage.presign_put, key)
+    return {"url": url, "key": key, "method": "PUT", "expires_in": settings.S3_UPLOAD_URL_EXPIRES_SEC}
+
+
+@router.post("/{call_id}/recording/complete", status_code=status.HTTP_202_ACCEPTED)
+async def complete_upload(
+    call_id: uuid.UUID,
+    payload: CompleteUploadIn,
+    priority: Priority = Query(Priority.normal, description="urgent jumps ahead in its queue"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Register an object uploaded via ``upload-url`` and queue its processing.
+
+    The API never reads the body: the size comes from a HEAD request and the
+    worker checks the headers first; an object that is not audio is deleted
+    and the call goes back to ``created``. Direct uploads are not deduplicated.
+    """
+    storage = get_storage()
+    if not isinstance(storage, S3Storage):
+        raise HTTPException(status_code=501, detail="direct_upload_not_supported")
+    if not _is_direct_upload_key(payload.key, call_id):
+        raise HTTPException(status_code=422, detail="invalid_upload_key")
+    if await get_call_cached(db, call_id) is None:
+        raise HTTPException(status_code=404, detail="call_not_found")
+    try:
+        size = await asyncio.to_thread(storage.size, payload.key)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="upload_not_found")
+    if size > settings.MAX_UPLOAD_BYTES:
+        await asyncio.to_thread(storage.delete, payload.key)
+        raise HTTPException(status_code=413, detail="file_too_large")
 
-    # 2) Create DB row and set call status to processing
+    options = task_options(None, size, priority)
+    dispatch = outbox_message("tasks.process_recording", [str(call_id), payload.key, None], **options)
     try:
-        rec = await create_recording(db, call_id=call_id, filename=dst.name)
+        rec = await create_recording(db, call_id=call_id, filename=payload.key, dispatch=dispatch)
     except RecordingAlreadyExists:
         raise HTTPException(status_code=409, detail="recording_already_exists")
+    except CallNotFound:
+        raise HTTPException(status_code=404, detail="call_not_found")
+
+    out = {"recording_id": str(rec["id"]), "filename": rec["filename"]}
+    return {**out, "status": "processing", "queue": options["queue"]}
+
+
+@router.get("/{call_id}/silence", response_model=SilenceMarksOut)
+async def get_silence(
+    call_id: uuid.UUID,
+    start_ms: Optional[int] = Query(None, ge=0, description="only intervals ending after this"),
+    end_ms: Optional[int] = Query(None, ge=0, description="only intervals starting before this"),
+    format: PayloadFormat = Query(PayloadFormat.json, description="binary: big-endian int32 pairs"),
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        marks = await get_silence_marks(db, call_id=call_id)
+    except RecordingNotFound:
+        raise HTTPException(status_code=404, detail="recording_not_found")
+    if marks is None:
+        raise HTTPException(status_code=409, detail="recording_not_ready")
+    # Binary search on the packed buffer: only the requested range is decoded
+    if format is PayloadFormat.binary:
+        return Response(
+            content=marks.blob_between(start_ms, end_ms),
+            media_type="application/octet-stream",
+            headers={"X-Silence-Total": str(len(marks))},
+        )
+    return {"total": len(marks), "items": marks.between(start_ms, end_ms)}
+
+
+@router.get("/{call_id}/peaks", response_model=PeaksOut)
+async def get_peaks(
+    call_id: uuid.UUID,
+    start_ms: int = Query(0, ge=0),
+    end_ms: Optional[int] = Query(None, gt=0, description="default: end of recording"),
+    width: int = Query(1000, ge=1, description="pixels to fill"),
+    level: Optional[int] = Query(None, ge=0, description="explicit zoom level (0 = finest)"),
+    format: PayloadFormat = Query(PayloadFormat.binary, description="binary: int8 (min, max) pairs"),
+    db: AsyncSession = Depends(get_db),
+):
+    rec = await get_recording_by_call_id(db, call_id=call_id)
+    if not rec:
+        raise HTTPException(status_code=404, detail="recording_not_found")
+    try:
+        f = await asyncio.to_thread(get_storage().open, peaks.peaks_key(rec.filename))
+    except FileNotFoundError:
+        raise HTTPException(status_code=409, detail="peaks_not_ready")
+    try:
+        return await _peaks_response(f, start_ms, end_ms, width, level, format)
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+async def _peaks_response(
+    f: BinaryIO,
+    start_ms: int,
+    end_ms: Optional[int],
+    width: int,
+    level: Optional[int],
+    format: PayloadFormat,
+) -> Response | dict:
+    try:
+        info = await asyncio.to_thread(peaks.read_info, f)
+    except FileNotFoundError:
+        raise HTTPException(status_code=409, detail="peaks_not_ready")
+    except peaks.PeaksError:
+        raise HTTPException(status_code=500, detail="corrupt_peaks")
+
+    stop_ms = end_ms if end_ms is not None else info.frames * 1000 // max(1, info.sample_rate)
+    if level is None:
+        level = info.pick_level(start_ms, stop_ms, width)
+    elif level >= len(info.levels):
+        raise HTTPException(status_code=422, detail="invalid_level")
+    start, end = peaks.bucket_range(info, level, start_ms, end_ms)
+    if end - start > settings.PEAKS_MAX_BUCKETS:
+        raise HTTPException(status_code=422, detail="too_many_buckets")
+    # Only the requested slice of the requested level is read from storage
+    data = await asyncio.to_thread(peaks.read_range, f, info, level, start, end)
+
+    meta = {
+        "sample_rate": info.sample_rate,
+        "samples_per_peak": info.bucket_samples(level),
+        "level": level,
+        "start": start,
+    }
+    if format is PayloadFormat.binary:
+        headers = {f"X-Peaks-{k.replace('_', '-').title()}": str(v) for k, v in meta.items()}
+        return Response(content=data, media_type="application/octet-stream", headers=headers)
+    return {**meta, "data": list(memoryview(data).cast("b"))}
 
-    # 3) Dispatch celery task
-    celery_app.send_task("tasks.process_recording", args=[str(call_id), str(dst)])
 
-    return {"recording_id": str(rec.id), "filename": rec.filename}
+def _is_direct_upload_key(key: str, call_id: uuid.UUID) -> bool:
+    """Only keys shaped like those from ``upload-url`` (no ``..``, no nesting)."""
+    prefix = f"{DIRECT_UPLOAD_PREFIX}{call_id}/"
+    if not key.startswith(prefix):
+        return False
+    m = _DIRECT_UPLOAD_NAME.fullmatch(key[len(prefix):])
+    return m is not None and m[1] in ALLOWED_EXT
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from celery import Celery
 from .config import settings
+from . import worker  # noqa: F401  (registers per-process loop/engine hooks)
+from . import metrics  # noqa: F401  (task timing/tracing signal handlers)
 
 celery_app = Celery(
     "calls_service",
@@ -13,5 +15,49 @@ celery_app.conf.task_acks_late = True
 celery_app.conf.worker_prefetch_multiplier = 1
 celery_app.conf.task_track_started = True
 
+# Recordings are routed per call to QUEUE_SHORT/QUEUE_LONG (services/routing.py);
+# within a queue, lower priority numbers are consumed first.
+celery_app.conf.task_default_priority = 3
+celery_app.conf.broker_transport_options = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+
+beat_schedule: dict = {}
+
+# Periodic flush of batched results (see tasks.flush_ready_results)
+if settings.READY_BATCH_ENABLED:
+    beat_schedule["flush-ready-results"] = {
+        "task": "tasks.flush_ready_results",
+        "schedule": settings.READY_BATCH_FLUSH_SEC,
+    }
+
+# Publish queued tasks from the outbox (see services/outbox.py). The relay
+# has its own queue and worker so dispatch never waits behind analysis; a
+# tick that was not picked up before the next one is dropped
+celery_app.conf.task_routes = {
+    "tasks.relay_outbox": {"queue": settings.QUEUE_OUTBOX},
+    "tasks.sweep_outbox": {"queue": settings.QUEUE_OUTBOX},
+}
+beat_schedule["relay-outbox"] = {
+    "task": "tasks.relay_outbox",
+    "schedule": settings.OUTBOX_RELAY_SEC,
+    "options": {"expires": settings.OUTBOX_RELAY_SEC},
+}
+beat_schedule["sweep-outbox"] = {
+    "task": "tasks.sweep_outbox",
+    "schedule": settings.OUTBOX_SWEEP_SEC,
+    "options": {"expires": settings.OUTBOX_SWEEP_SEC},
+}
+
+# New monthly call partitions and retention (see services/partitions.py)
+beat_schedule["maintain-call-partitions"] = {
+    "task": "tasks.maintain_call_partitions",
+    "schedule": settings.PARTITION_MAINTENANCE_SEC,
+}
+
+celery_app.conf.beat_schedule = beat_schedule
+
 # Autodiscover tasks inside app package
 celery_app.autodiscover_tasks(["app"])
@@ -1,9 +1,22 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import DirectoryPath
+from pydantic import DirectoryPath, model_validator
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "postgresql+asyncpg://app:app@db:5432/calls"
+    # Connection pool per process (each API replica and each Celery worker
+    # child): at most DB_POOL_SIZE + DB_MAX_OVERFLOW connections. Size it so
+    # processes * (size + overflow) stays below Postgres max_connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SEC: float = 30.0
+    DB_POOL_RECYCLE_SEC: int = 1800  # -1: never recycle
+    DB_POOL_PRE_PING: bool = True
+    # PgBouncer in transaction pooling mode: no asyncpg prepared statement
+    # caches, and workers use NullPool (PgBouncer does the pooling)
+    DB_PGBOUNCER: bool = False
+    # NullPool in Celery workers regardless of DB_PGBOUNCER
+    DB_WORKER_NULLPOOL: bool = False
     REDIS_URL: str = "redis://redis:6379/0"
     # Allow string path in containers; DirectoryPath valid after mount
     RECORDINGS_DIR: DirectoryPath | str = "/recordings"
@@ -11,7 +24,69 @@ class Settings(BaseSettings):
     APP_ENV: str = "dev"
     APP_NAME: str = "CallsService"
 
-    # Optional S3/MinIO settings for presigned URLs
+    # Read-through cache for GET /calls/{id}: in-process LRU, optional Redis tier
+    CALL_CACHE_ENABLED: bool = True
+    CALL_CACHE_SIZE: int = 10_000
+    CALL_CACHE_TTL_SEC: float = 2.0
+    CALL_CACHE_REDIS: bool = False
+    CALL_CACHE_REDIS_TTL_SEC: int = 30
+
+    # Recording queues: duration >= QUEUE_LONG_MIN_SEC (or, if unknown, size
+    # >= QUEUE_LONG_MIN_BYTES) goes to QUEUE_LONG; run each with its own worker
+    QUEUE_SHORT: str = "recordings.short"
+    QUEUE_LONG: str = "recordings.long"
+    QUEUE_LONG_MIN_SEC: float = 600.0
+    QUEUE_LONG_MIN_BYTES: int = 20 * 1024 * 1024
+
+    # Worker batching: finished analyses are queued in Redis and committed
+    # READY_BATCH_SIZE at a time (or every READY_BATCH_FLUSH_SEC via beat)
+    READY_BATCH_ENABLED: bool = False
+    READY_BATCH_SIZE: int = 50
+    READY_BATCH_FLUSH_SEC: float = 2.0
+    READY_BATCH_MAX_ATTEMPTS: int = 5
+
+    # SSE status stream (GET /calls/events)
+    EVENTS_HEARTBEAT_SEC: float = 15.0
+    EVENTS_MAX_CALLS: int = 100
+
+    # POST /calls/bulk: rows per INSERT ... RETURNING statement (and commit);
+    # a JSON-array element still undecoded after this many characters fails
+    BULK_BATCH_SIZE: int = 1000
+    BULK_MAX_ITEM_CHARS: int = 64 * 1024
+
+    # Uploads larger than this are rejected with 413 while streaming to disk
+    MAX_UPLOAD_BYTES: int = 512 * 1024 * 1024
+
+    # Silence detection (RMS over fixed frames, see services/silence.py)
+    SILENCE_THRESHOLD_DB: float = -40.0
+    SILENCE_MIN_MS: int = 500
+    SILENCE_PADDING_MS: int = 100
+    SILENCE_FRAME_MS: int = 20
+
+    # Streaming analysis: files of at least AUDIO_STREAM_MIN_BYTES are read in
+    # fixed-size chunks instead of being decoded into memory at once
+    AUDIO_STREAMING: bool = True
+    AUDIO_STREAM_MIN_BYTES: int = 64 * 1024 * 1024
+    AUDIO_STREAM_CHUNK_FRAMES: int = 65536
+
+    # Parallel analysis: recordings of at least PARALLEL_MIN_SEC are cut into
+    # PARALLEL_SEGMENT_SEC segments, analysed as separate tasks on QUEUE_SHORT
+    # and merged by a chord callback
+    PARALLEL_ANALYSIS: bool = True
+    PARALLEL_MIN_SEC: float = 1800.0
+    PARALLEL_SEGMENT_SEC: float = 300.0
+
+    # Waveform peaks (services/peaks.py): min/max per PEAKS_SAMPLES_PER_PEAK
+    # samples at level 0; responses are capped at PEAKS_MAX_BUCKETS buckets
+    PEAKS_ENABLED: bool = True
+    PEAKS_SAMPLES_PER_PEAK: int = 256
+    PEAKS_MAX_BUCKETS: int = 10000
+
+    # Serve recordings from RECORDINGS_DIR via GET /calls/{id}/audio; /download
+    # falls back to it when S3 presigning is not configured
+    LOCAL_DOWNLOADS: bool = True
+
+    # Optional S3/MinIO settings for presigned URLs (implied by STORAGE_BACKEND=s3)
     S3_ENABLED: bool = False
     S3_ENDPOINT_URL: str | None = None
     S3_ACCESS_KEY: str | None = None
@@ -19,6 +94,61 @@ class Settings(BaseSettings):
     S3_BUCKET: str | None = None
     S3_REGION: str | None = "us-east-1"
     S3_SECURE: bool = False
+    S3_MAX_POOL_CONNECTIONS: int = 32
+
+    # Storage backend for recordings: "local" (RECORDINGS_DIR) or "s3" (S3_BUCKET;
+    # multipart uploads, workers cache objects in S3_CACHE_DIR)
+    STORAGE_BACKEND: str = "local"
+    S3_PART_SIZE: int = 8 * 1024 * 1024
+    S3_TRANSFER_CONCURRENCY: int = 4
+    S3_READ_BUFFER: int = 256 * 1024
+    S3_CACHE_DIR: str = "/tmp/calls-s3-cache"
+    S3_CACHE_MAX_BYTES: int = 10 * 1024 * 1024 * 1024
+    S3_UPLOAD_URL_EXPIRES_SEC: int = 900
+
+    # Presigned GET URLs: cached per object and reused while at least
+    # PRESIGN_CACHE_MIN_TTL_SEC of validity is left
+    PRESIGN_EXPIRES_SEC: int = 3600
+    PRESIGN_CACHE_SIZE: int = 10000
+    PRESIGN_CACHE_MIN_TTL_SEC: int = 600
+    PRESIGN_BATCH_MAX: int = 1000
+
+    # Prometheus metrics: GET /metrics on the API, WORKER_METRICS_PORT on each
+    # Celery worker (0 = off). Multi-process setups need PROMETHEUS_MULTIPROC_DIR
+    METRICS_ENABLED: bool = True
+    WORKER_METRICS_PORT: int = 0
+    # OpenTelemetry spans (needs opentelemetry-api plus an SDK/exporter)
+    TRACING_ENABLED: bool = False
+
+    # Transactional outbox: recording tasks are stored with the upload and
+    # published by tasks.relay_outbox (beat, every OUTBOX_RELAY_SEC) on its own
+    # QUEUE_OUTBOX worker. tasks.sweep_outbox (every OUTBOX_SWEEP_SEC) re-sends
+    # tasks of calls still processing OUTBOX_REDISPATCH_SEC after dispatch and
+    # deletes rows of finished calls
+    QUEUE_OUTBOX: str = "outbox"
+    OUTBOX_RELAY_SEC: float = 1.0
+    OUTBOX_SWEEP_SEC: float = 300.0
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_REDISPATCH_SEC: float = 3600.0
+    OUTBOX_MAX_ATTEMPTS: int = 3
+
+    # Monthly partitions of `call` by started_at (services/partitions.py), kept
+    # CALL_PARTITIONS_AHEAD months ahead by beat every PARTITION_MAINTENANCE_SEC.
+    # Months older than CALL_RETENTION_MONTHS (0 = keep everything) are detached,
+    # exported with their recordings to CALL_ARCHIVE_PREFIX in storage and dropped
+    CALL_PARTITIONS_AHEAD: int = 3
+    CALL_RETENTION_MONTHS: int = 0
+    CALL_ARCHIVE_PREFIX: str = "archive/calls/"
+    PARTITION_MAINTENANCE_SEC: float = 3600.0
+
+    @model_validator(mode="after")
+    def _check_storage(self) -> "Settings":
+        # Fail at start-up instead of on the first upload
+        if self.STORAGE_BACKEND not in ("local", "s3"):
+            raise ValueError("STORAGE_BACKEND must be 'local' or 's3'")
+        if self.STORAGE_BACKEND == "s3" and not self.S3_BUCKET:
+            raise ValueError("STORAGE_BACKEND=s3 needs S3_BUCKET")
+        return self
 
     # Pydantic v2 settings config
     model_config = SettingsConfigDict(
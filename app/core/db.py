@@ -1,11 +1,14 @@
 from __future__ import annotations
-from typing import AsyncIterator
+import uuid
+from typing import Any, AsyncIterator
 from sqlalchemy.ext.asyncio import (
-    create_async_engine, AsyncSession, async_sessionmaker,
+    create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker,
 )
+from sqlalchemy.pool import NullPool
 from sqlalchemy.orm import DeclarativeBase, declared_attr
 from sqlalchemy import MetaData
 from .config import settings
+from .metrics import instrument_engine
 
 NAMING_CONVENTION = {
     "ix": "ix_%(column_0_label)s",
@@ -26,10 +29,47 @@ class Base(DeclarativeBase):
         return cls.__name__.lower()
 
 
-engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
+def make_engine(*, null_pool: bool = False) -> AsyncEngine:
+    """Engine from the DB_* settings; ``null_pool`` opens a connection per checkout."""
+    kwargs: dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if null_pool:
+        kwargs["poolclass"] = NullPool
+    else:
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SEC,
+            pool_recycle=settings.DB_POOL_RECYCLE_SEC,
+        )
+    if settings.DB_PGBOUNCER:
+        # Transaction pooling hands each transaction a different server
+        # connection: prepared statements must be neither cached nor reused
+        kwargs["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    new = create_async_engine(settings.DATABASE_URL, **kwargs)
+    if settings.METRICS_ENABLED:
+        instrument_engine(new)
+    return new
+
+
+def worker_null_pool() -> bool:
+    return settings.DB_PGBOUNCER or settings.DB_WORKER_NULLPOOL
+
+
+engine = make_engine()
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
+def use_engine(new: AsyncEngine) -> None:
+    """Rebind the module engine and ``SessionLocal`` (worker process start-up)."""
+    global engine
+    engine = new
+    SessionLocal.configure(bind=new)
+
+
 async def get_session() -> AsyncIterator[AsyncSession]:
     async with SessionLocal() as session:
         yield session
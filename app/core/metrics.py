@@ -0,0 +1,262 @@
+from __future__ import annotations
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+from celery.signals import (
+    before_task_publish, task_postrun, task_prerun, worker_init, worker_process_shutdown,
+)
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest,
+    multiprocess, start_http_server,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from . import tracing
+from .config import settings
+
+# Prometheus metrics for the API (GET /metrics) and the workers (WORKER_METRICS_PORT).
+# With several processes (uvicorn --workers, Celery prefork) set
+# PROMETHEUS_MULTIPROC_DIR so every process writes to shared files.
+_SLOW_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+DB_QUERY = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_ERRORS = Counter("db_query_errors_total", "SQL statements that raised", ["operation"])
+TASK_QUEUE_WAIT = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Time from publish to start of execution",
+    ["task", "queue"],
+    buckets=_SLOW_BUCKETS,
+)
+TASK_RUN = Histogram(
+    "celery_task_run_seconds",
+    "Task execution time",
+    ["task", "state"],
+    buckets=_SLOW_BUCKETS,
+)
+AUDIO_STAGE = Histogram(
+    "audio_stage_seconds",
+    "Time per audio pipeline stage (decode and each analyzer)",
+    ["stage"],
+    buckets=_SLOW_BUCKETS,
+)
+OUTBOX_LAG = Histogram(
+    "outbox_dispatch_lag_seconds",
+    "Time from queueing a task in the outbox to publishing it",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 300),
+)
+
+PUBLISHED_AT_HEADER = "published_at"
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        AUDIO_STAGE.labels(stage).observe(time.perf_counter() - t0)
+
+
+def observe_stages(timings: dict[str, float]) -> None:
+    for stage, seconds in timings.items():
+        AUDIO_STAGE.labels(stage).observe(seconds)
+
+
+# --- API ---------------------------------------------------------------------
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (does not buffer streaming/SSE responses).
+
+    Latency is labelled with the matched route template, never the raw path,
+    so label cardinality stays bounded; unmatched requests share one label.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        t0 = time.perf_counter()
+        with tracing.server_span(scope) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    # Annotate before the body: an outer span may end with the response
+                    tracing.annotate_server_span(span, scope, _route(scope), status)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                template = _route(scope)
+                if settings.METRICS_ENABLED and template != "/metrics":
+                    elapsed = time.perf_counter() - t0
+                    HTTP_LATENCY.labels(scope["method"], template, str(status)).observe(elapsed)
+
+
+def _route(scope: Scope) -> str:
+    # The router stores the matched route in the (shared) scope
+    return getattr(scope.get("route"), "path", None) or "<unmatched>"
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_CacheCollector())
+        registry.register(_PoolCollector())
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class _CacheCollector:
+    """Exports ``call_cache`` counters (this process) next to the other metrics."""
+
+    def describe(self) -> list:
+        return []  # keeps register() from importing the cache (and the models) early
+
+    def collect(self):
+        from ..services.cache import call_cache
+
+        snap = call_cache.snapshot()
+        size = snap.pop("size_local")
+        events = CounterMetricFamily(
+            "call_cache_events", "GET /calls/{id} cache events", labels=["kind"]
+        )
+        for kind, value in snap.items():
+            events.add_metric([kind], value)
+        yield events
+        yield GaugeMetricFamily("call_cache_size", "Entries in the local call cache", value=size)
+
+
+class _PoolCollector:
+    """Connection pool usage of this process's engine (absent under NullPool)."""
+
+    def describe(self) -> list:
+        return []
+
+    def collect(self):
+        from . import db
+
+        pool = db.engine.sync_engine.pool
+        if not hasattr(pool, "checkedout"):
+            return
+        for name, doc, value in (
+            ("db_pool_size", "Configured persistent connections", pool.size()),
+            ("db_pool_max", "Connection limit (size + max overflow)",
+             pool.size() + settings.DB_MAX_OVERFLOW),
+            ("db_pool_checked_out", "Connections in use", pool.checkedout()),
+            ("db_pool_checked_in", "Idle connections in the pool", pool.checkedin()),
+            ("db_pool_overflow", "Connections above pool size (<0: not opened yet)",
+             pool.overflow()),
+        ):
+            yield GaugeMetricFamily(name, doc, value=value)
+
+
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    REGISTRY.register(_CacheCollector())
+    REGISTRY.register(_PoolCollector())
+
+
+# --- Database ----------------------------------------------------------------
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement via cursor execute events on the sync engine."""
+    target = engine.sync_engine
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        t0 = conn.info["query_start"].pop()
+        DB_QUERY.labels(_operation(statement)).observe(time.perf_counter() - t0)
+
+    @event.listens_for(target, "handle_error")
+    def _error(ctx) -> None:
+        starts = ctx.connection.info.get("query_start") if ctx.connection is not None else None
+        if starts:
+            starts.pop()
+        DB_ERRORS.labels(_operation(ctx.statement or "")).inc()
+
+
+def _operation(statement: str) -> str:
+    word = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return word if word in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else "OTHER"
+
+
+# --- Celery ------------------------------------------------------------------
+
+_task_started: dict[str, float] = {}
+
+
+@before_task_publish.connect
+def _on_publish(headers: dict | None = None, **_: Any) -> None:
+    if headers is not None:
+        headers[PUBLISHED_AT_HEADER] = time.time()
+        tracing.inject(headers)
+
+
+@task_prerun.connect
+def _on_prerun(task_id: str, task: Any, **_: Any) -> None:
+    tracing.start_task_span(task_id, task)
+    if not settings.METRICS_ENABLED:
+        return
+    req = task.request
+    # Custom headers land on the request itself (protocol 2) or in .headers
+    published = getattr(req, PUBLISHED_AT_HEADER, None)
+    if published is None:
+        published = (req.headers or {}).get(PUBLISHED_AT_HEADER)
+    if published:
+        queue = (req.delivery_info or {}).get("routing_key") or "unknown"
+        wait = max(0.0, time.time() - float(published))
+        TASK_QUEUE_WAIT.labels(task.name, queue).observe(wait)
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _on_postrun(task_id: str, task: Any, state: str | None = None, **_: Any) -> None:
+    tracing.end_task_span(task_id, state)
+    t0 = _task_started.pop(task_id, None)
+    if t0 is not None:
+        TASK_RUN.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - t0)
+
+
+@worker_init.connect
+def _on_worker_init(**_: Any) -> None:
+    # Runs once in the main worker process; prefork children write to
+    # PROMETHEUS_MULTIPROC_DIR, which this server aggregates
+    if not settings.METRICS_ENABLED or not settings.WORKER_METRICS_PORT:
+        return
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    start_http_server(settings.WORKER_METRICS_PORT, registry=registry)
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(**_: Any) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
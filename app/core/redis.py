@@ -0,0 +1,39 @@
+from __future__ import annotations
+import asyncio
+import weakref
+from typing import Any
+from .config import settings
+
+try:
+    import redis.asyncio as aioredis  # type: ignore
+    from redis.exceptions import RedisError, WatchError  # type: ignore
+except Exception:  # optional dependency
+    aioredis = None
+
+    class RedisError(Exception):  # type: ignore[no-redef]
+        pass
+
+    class WatchError(RedisError):  # type: ignore[no-redef]
+        pass
+
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = weakref.WeakKeyDictionary()
+
+
+def redis_available() -> bool:
+    return aioredis is not None
+
+
+def get_redis() -> Any:
+    """Shared async Redis client for the running event loop.
+
+    redis.asyncio connections are bound to the loop that created them, so
+    each loop gets its own: the API process's, or the long-lived loop a
+    Celery worker process runs all its tasks on (``core/worker.py``).
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = aioredis.from_url(settings.REDIS_URL)
+        _clients[loop] = client
+    return client
@@ -0,0 +1,102 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Any, Iterator
+from .config import settings
+
+# Optional OpenTelemetry spans (TRACING_ENABLED). Only the API package is
+# imported here; exporters/SDK are configured by the deployment, e.g. via
+# `opentelemetry-instrument`. Without them every span is a cheap no-op.
+try:
+    from opentelemetry import context as otel_context  # type: ignore
+    from opentelemetry import propagate, trace  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    trace = None
+
+_TRACER_NAME = "calls_service"
+_task_spans: dict[str, tuple[Any, Any]] = {}
+
+
+def enabled() -> bool:
+    return settings.TRACING_ENABLED and trace is not None
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Child span of the current one; ``call_id`` and friends go in ``attributes``."""
+    if not enabled():
+        yield None
+        return
+    attrs = {k: str(v) for k, v in attributes.items() if v is not None}
+    with trace.get_tracer(_TRACER_NAME).start_as_current_span(name, attributes=attrs) as s:
+        yield s
+
+
+def inject(carrier: dict) -> None:
+    """Put the current trace context into Celery message headers.
+
+    Headers that already carry a context (tasks relayed from the outbox keep
+    the one of the request that queued them) are left alone.
+    """
+    if enabled() and "traceparent" not in carrier:
+        propagate.inject(carrier)
+
+
+# --- API requests (driven by metrics.MetricsMiddleware) -----------------------
+
+@contextmanager
+def server_span(scope: dict) -> Iterator[Any]:
+    if not enabled():
+        yield None
+        return
+    current = trace.get_current_span()
+    if current.is_recording():
+        # Already traced by an outer ASGI instrumentation: annotate its span
+        yield current
+        return
+    carrier = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope.get("headers", [])}
+    ctx = propagate.extract(carrier)
+    tracer = trace.get_tracer(_TRACER_NAME)
+    name = f"{scope['method']} {scope['path']}"
+    kind = trace.SpanKind.SERVER
+    with tracer.start_as_current_span(name, context=ctx, kind=kind) as s:
+        yield s
+
+
+def annotate_server_span(s: Any, scope: dict, route: str, status: int) -> None:
+    if s is None:
+        return
+    s.update_name(f"{scope['method']} {route}")
+    s.set_attribute("http.route", route)
+    s.set_attribute("http.response.status_code", status)
+    call_id = scope.get("path_params", {}).get("call_id")
+    if call_id is not None:
+        s.set_attribute("call_id", str(call_id))
+
+
+# --- Celery tasks (driven by metrics signal handlers) -------------------------
+
+def start_task_span(task_id: str, task: Any) -> None:
+    """Continue the publisher's trace: the span stays current for the task body."""
+    if not enabled():
+        return
+    req = task.request
+    carrier = {**(req.headers or {}), **{k: v for k, v in vars(req).items() if isinstance(v, str)}}
+    ctx = propagate.extract(carrier)
+    s = trace.get_tracer(_TRACER_NAME).start_span(
+        f"task {task.name}",
+        context=ctx,
+        kind=trace.SpanKind.CONSUMER,
+        attributes={"celery.task_id": task_id},
+    )
+    token = otel_context.attach(trace.set_span_in_context(s))
+    _task_spans[task_id] = (s, token)
+
+
+def end_task_span(task_id: str, state: str | None) -> None:
+    entry = _task_spans.pop(task_id, None)
+    if entry is None:
+        return
+    s, token = entry
+    s.set_attribute("celery.state", state or "UNKNOWN")
+    otel_context.detach(token)
+    s.end()
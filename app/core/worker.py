@@ -0,0 +1,45 @@
+from __future__ import annotations
+import asyncio
+from typing import Any, Coroutine, TypeVar
+from celery.signals import worker_process_init, worker_process_shutdown
+
+T = TypeVar("T")
+
+# One event loop per worker process, reused by every task so the async
+# engine's pooled asyncpg connections (bound to this loop) survive between tasks.
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run ``coro`` on the worker's long-lived loop (created on first use)."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+@worker_process_init.connect
+def _init_worker_process(**_: Any) -> None:
+    from . import db
+
+    # Never reuse connections inherited from the parent across fork
+    db.engine.sync_engine.dispose(close=False)
+    if db.worker_null_pool():
+        # Idle pools in every worker child add up; let PgBouncer pool instead
+        db.use_engine(db.make_engine(null_pool=True))
+    global _loop
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**_: Any) -> None:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        return
+    from .db import engine
+
+    _loop.run_until_complete(engine.dispose())
+    _loop.close()
+    _loop = None
@@ -1,8 +1,29 @@
 from __future__ import annotations
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from .api.routes import calls as calls_routes
+from .api.routes import events as events_routes
+from .api.routes import ops as ops_routes
 from .api.routes import recordings as rec_routes
+from .core.metrics import MetricsMiddleware
+from .services.cache import call_cache
 
-app = FastAPI(title="Calls Service")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Evict cached calls changed by other processes (no-op without Redis tier)
+    listener = asyncio.create_task(call_cache.listen())
+    yield
+    listener.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await listener
+
+
+app = FastAPI(title="Calls Service", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+app.include_router(events_routes.router)
 app.include_router(calls_routes.router)
 app.include_router(rec_routes.router)
+app.include_router(ops_routes.router)
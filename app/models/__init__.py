@@ -1,4 +1,6 @@
 from .call import Call, CallStatus
 from .recording import Recording
+from .analysis import AnalysisCache
+from .outbox import Outbox
 
-__all__ = ["Call", "CallStatus", "Recording"]
+__all__ = ["Call", "CallStatus", "Recording", "AnalysisCache", "Outbox"]
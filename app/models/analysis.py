@@ -0,0 +1,19 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, String, Integer, LargeBinary
+from ..core.db import Base
+
+
+class AnalysisCache(Base):
+    """Analysis output per (content hash, analyzer version), shared by duplicate uploads."""
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    analyzer_version: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    duration_sec: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    transcription: Mapped[Optional[str]] = mapped_column(String(4000), nullable=True)
+    silence_marks: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)  # packed, see Recording
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import StrEnum
 from typing import Optional
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import DateTime, Enum, String
+from sqlalchemy import Computed, DateTime, Enum, Index, PrimaryKeyConstraint, String, func
 from ..core.db import Base
 
 
@@ -15,9 +15,23 @@ class CallStatus(StrEnum):
 
 
 class Call(Base):
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    # Range-partitioned by month on started_at (services/partitions.py); Postgres
+    # needs the partition key in the primary key, the ORM identity stays ``id``
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "started_at"),
+        {"postgresql_partition_by": "RANGE (started_at)"},
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(default=uuid.uuid4)
     caller: Mapped[str] = mapped_column(String(32), nullable=False)  # E.164
     receiver: Mapped[str] = mapped_column(String(32), nullable=False)
+    # Digits-only copies maintained by Postgres; used by phone search indexes
+    caller_digits: Mapped[str] = mapped_column(
+        String(32), Computed("regexp_replace(caller, '[^0-9]', '', 'g')", persisted=True)
+    )
+    receiver_digits: Mapped[str] = mapped_column(
+        String(32), Computed("regexp_replace(receiver, '[^0-9]', '', 'g')", persisted=True)
+    )
     started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     status: Mapped[CallStatus] = mapped_column(Enum(CallStatus), default=CallStatus.created, nullable=False)
 
@@ -26,7 +40,27 @@ class Call(Base):
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
-    # one-to-one Recording
+    # one-to-one Recording (no FK: it cannot reference a partitioned table by id alone)
     recording: Mapped[Optional["Recording"]] = relationship(
-        back_populates="call", uselist=False, cascade="all, delete-orphan"
+        back_populates="call",
+        uselist=False,
+        cascade="all, delete-orphan",
+        primaryjoin="Call.id == foreign(Recording.call_id)",
+    )
+
+    __mapper_args__ = {"primary_key": [id]}
+
+
+# Keyset pagination order: (created_at DESC, id DESC)
+Index("ix_call_created_at_id", Call.created_at.desc(), Call.id.desc())
+
+# Phone search (see services/phone_search.py): substring via pg_trgm,
+# prefix/suffix via text_pattern_ops btrees on the digits and their reverse
+for _col in (Call.caller_digits, Call.receiver_digits):
+    Index(f"ix_call_{_col.key}_trgm", _col, postgresql_using="gin", postgresql_ops={_col.key: "gin_trgm_ops"})
+    Index(f"ix_call_{_col.key}_prefix", _col, postgresql_ops={_col.key: "text_pattern_ops"})
+    Index(
+        f"ix_call_{_col.key}_suffix",
+        func.reverse(_col).label(f"{_col.key}_reversed"),
+        postgresql_ops={f"{_col.key}_reversed": "text_pattern_ops"},
     )
@@ -0,0 +1,28 @@
+from __future__ import annotations
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, BigInteger, DateTime, Identity, Index, Integer, String, func
+from ..core.db import Base
+
+
+class Outbox(Base):
+    """Celery task waiting to be published, written in the same transaction
+    as the state change that needs it (see services/outbox.py)."""
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    call_id: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True, index=True)
+    task: Mapped[str] = mapped_column(String(128), nullable=False)
+    args: Mapped[list] = mapped_column(JSON, nullable=False)
+    options: Mapped[dict] = mapped_column(JSON, nullable=False)  # queue, priority, headers
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    dispatched_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+# Relay scan: pending rows in insertion order
+Index("ix_outbox_pending", Outbox.id, postgresql_where=Outbox.dispatched_at.is_(None))
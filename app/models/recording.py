@@ -1,24 +1,30 @@
 from __future__ import annotations
 import uuid
 from datetime import datetime
-from typing import Optional, Any
+from typing import Optional
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import DateTime, ForeignKey, String, Integer, JSON
+from sqlalchemy import DateTime, String, Integer, LargeBinary
 from ..core.db import Base
 
 
 class Recording(Base):
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
-    call_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("call.id", ondelete="CASCADE"), unique=True, index=True)
+    # Plain column: call is partitioned, rows go away with their partition (retention job)
+    call_id: Mapped[uuid.UUID] = mapped_column(unique=True, index=True)
 
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    # sha256 of the stored bytes; filename points into the content-addressed store
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
     duration_sec: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     transcription: Mapped[Optional[str]] = mapped_column(String(4000), nullable=True)
-    silence_marks: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
+    # Packed int32 ms pairs (services/marks.py); deferred so call reads skip the blob
+    silence_marks: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
-    call: Mapped["Call"] = relationship(back_populates="recording")
+    call: Mapped["Call"] = relationship(
+        back_populates="recording", primaryjoin="Call.id == foreign(Recording.call_id)"
+    )
@@ -20,6 +20,24 @@ class RecordingOut(BaseModel):
     transcription: Optional[str] = None
 
 
+class SilenceInterval(BaseModel):
+    start: int  # ms
+    end: int
+
+
+class SilenceMarksOut(BaseModel):
+    total: int  # intervals in the whole recording
+    items: List[SilenceInterval]  # intervals overlapping the requested range
+
+
+class PeaksOut(BaseModel):
+    sample_rate: int
+    samples_per_peak: int  # samples per bucket at the returned level
+    level: int
+    start: int  # index of the first bucket
+    data: List[int]  # interleaved min, max in [-127, 127]
+
+
 class CallOut(BaseModel):
     id: uuid.UUID
     caller: str
@@ -33,5 +51,45 @@ class CallOut(BaseModel):
 
 
 class CallsPage(BaseModel):
-    total: int
+    total: Optional[int] = None  # None when total=none; approximate when total=estimate
     items: List[CallOut]
+    next_cursor: Optional[str] = None
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[uuid.UUID] = None
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    created: int
+    failed: int
+    items: List[BulkItemResult]
+
+
+class DownloadUrlsIn(BaseModel):
+    call_ids: List[uuid.UUID] = Field(..., min_length=1)
+
+
+class DownloadUrlItem(BaseModel):
+    call_id: uuid.UUID
+    url: Optional[str] = None
+    expires_in: Optional[int] = None  # seconds this URL stays valid; None for local URLs
+    error: Optional[str] = None
+
+
+class DownloadUrlsOut(BaseModel):
+    expires_in: Optional[int] = None  # shortest remaining lifetime of the URLs; None for local
+    items: List[DownloadUrlItem]
+
+
+class UploadUrlOut(BaseModel):
+    url: str
+    key: str  # pass back to /recording/complete
+    method: str
+    expires_in: int
+
+
+class CompleteUploadIn(BaseModel):
+    key: str
@@ -0,0 +1,40 @@
+from __future__ import annotations
+from typing import Any
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import AnalysisCache
+from .marks import encode_marks
+
+
+async def get_cached_analysis(session: AsyncSession, *, content_hash: str, version: str) -> dict | None:
+    stmt = select(
+        AnalysisCache.duration_sec,
+        AnalysisCache.transcription,
+        AnalysisCache.silence_marks,
+    ).where(AnalysisCache.content_hash == content_hash, AnalysisCache.analyzer_version == version)
+    r = (await session.execute(stmt)).one_or_none()
+    if r is None:
+        return None
+    # Silence stays packed: mark_ready stores it without re-encoding
+    return {"duration": r.duration_sec, "transcript": r.transcription, "silence": r.silence_marks}
+
+
+async def store_analysis(
+    session: AsyncSession,
+    *,
+    content_hash: str,
+    version: str,
+    duration: int,
+    transcript: str,
+    silence: Any,
+) -> None:
+    """Insert a cache entry (first writer wins). Does not commit."""
+    stmt = pg_insert(AnalysisCache).values(
+        content_hash=content_hash,
+        analyzer_version=version,
+        duration_sec=duration,
+        transcription=transcript,
+        silence_marks=encode_marks(silence),
+    ).on_conflict_do_nothing(index_elements=["content_hash", "analyzer_version"])
+    await session.execute(stmt)
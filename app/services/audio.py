@@ -1,26 +1,117 @@
 from __future__ import annotations
+from dataclasses import asdict
 from pathlib import Path
-from typing import List, Dict
+from typing import Any, Dict, List, Protocol, Sequence
 from pydub import AudioSegment
+from ..core.metrics import stage_timer
+from .probe import probe
+from .silence import detect_silence, silence_params, to_mono_float
 
+TRANSCRIPT_SAMPLE_MS = 20_000
+# Bump when analyzer output changes so cached results are not reused
+ANALYSIS_VERSION = 2
+
+
+class Analyzer(Protocol):
+    """A single metric computed over an already decoded recording.
+
+    Analyzers never touch the file themselves: the pipeline decodes once and
+    hands the same ``AudioSegment`` to every analyzer, so adding a metric does
+    not add another ffmpeg run.
+    """
+
+    name: str
+
+    def analyze(self, audio: AudioSegment) -> Any: ...
+
+
+class DurationAnalyzer:
+    name = "duration"
+
+    def analyze(self, audio: AudioSegment) -> int:
+        return int(audio.duration_seconds)
+
+
+class TranscriptSampleAnalyzer:
+    name = "transcript"
+
+    def __init__(self, sample_ms: int = TRANSCRIPT_SAMPLE_MS) -> None:
+        self.sample_ms = sample_ms
+
+    def analyze(self, audio: AudioSegment) -> str:
+        sample_ms = min(len(audio), self.sample_ms)
+        _ = audio[:sample_ms]
+        return f"Detected speech fragment: {sample_ms}ms sample"
+
+
+class SilenceMarksAnalyzer:
+    """Real silence intervals (ms) from frame RMS levels, see ``services.silence``."""
+
+    name = "silence"
+
+    def __init__(
+        self,
+        *,
+        threshold_db: float | None = None,
+        min_silence_ms: int | None = None,
+        padding_ms: int | None = None,
+        frame_ms: int | None = None,
+    ) -> None:
+        self.params = silence_params(
+            threshold_db=threshold_db,
+            min_silence_ms=min_silence_ms,
+            padding_ms=padding_ms,
+            frame_ms=frame_ms,
+        )
+
+    def analyze(self, audio: AudioSegment) -> List[Dict[str, int]]:
+        return detect_silence(to_mono_float(audio), audio.frame_rate, **asdict(self.params))
+
+
+DEFAULT_ANALYZERS: tuple[Analyzer, ...] = (
+    DurationAnalyzer(),
+    TranscriptSampleAnalyzer(),
+    SilenceMarksAnalyzer(),
+)
+
+
+def analysis_version() -> str:
+    """Cache key component: code version plus the settings that shape the output."""
+    p = silence_params()
+    return (
+        f"v{ANALYSIS_VERSION}:silence={p.threshold_db:g}/{p.min_silence_ms}"
+        f"/{p.padding_ms}/{p.frame_ms}"
+    )
+
+
+def decode(path: Path) -> AudioSegment:
+    with stage_timer("decode"):
+        return AudioSegment.from_file(path)
+
+
+def analyze(audio: AudioSegment, analyzers: Sequence[Analyzer] = DEFAULT_ANALYZERS) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for a in analyzers:
+        with stage_timer(a.name):
+            out[a.name] = a.analyze(audio)
+    return out
+
+
+def analyze_file(path: Path, analyzers: Sequence[Analyzer] = DEFAULT_ANALYZERS) -> Dict[str, Any]:
+    """Decode ``path`` once and run every analyzer against the shared buffer."""
+    return analyze(decode(path), analyzers)
+
+
+# Single-metric helpers (each decodes the file; prefer analyze_file for several metrics)
 
 def duration_seconds(path: Path) -> int:
-    audio = AudioSegment.from_file(path)
-    return int(audio.duration_seconds)
+    # Header-only for WAV/MP3; decodes only when the headers cannot be parsed
+    return int(probe(path).duration)
 
 
 def fake_transcript_first_20s(path: Path) -> str:
-    audio = AudioSegment.from_file(path)
-    sample_ms = min(len(audio), 20_000)
-    _ = audio[:sample_ms]
-    return f"Detected speech fragment: {sample_ms}ms sample"
-
-
-def fake_silence_marks(path: Path, window_sec: int = 5) -> List[Dict[str, int]]:
-    total = duration_seconds(path)
-    marks: List[Dict[str, int]] = []
-    t = window_sec
-    while t < total:
-        marks.append({"start": t, "end": min(t + 1, total)})
-        t += window_sec * 2
-    return marks
+    return TranscriptSampleAnalyzer().analyze(decode(path))
+
+
+def silence_marks(path: Path) -> List[Dict[str, int]]:
+    return SilenceMarksAnalyzer().analyze(decode(path))
@@ -0,0 +1,342 @@
+from __future__ import annotations
+import os
+import subprocess
+import tempfile
+import time
+import wave
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Protocol, Sequence
+import numpy as np
+from ..core.config import settings
+from ..core.metrics import observe_stages
+from .audio import TRANSCRIPT_SAMPLE_MS
+from .silence import (
+    frame_length,
+    frame_rms_db,
+    intervals_ms,
+    pcm_to_mono,
+    silence_params,
+    silent_runs,
+)
+
+# Sample rate/format requested from ffmpeg for non-WAV sources (mono s16le)
+FFMPEG_SAMPLE_RATE = 16_000
+FFMPEG_ERROR_TAIL = 4096  # bytes of ffmpeg stderr kept for the error message
+_WAV_WIDTHS = {1, 2, 4}
+
+
+class AudioStreamError(Exception):
+    pass
+
+
+class StreamingAnalyzer(Protocol):
+    """Incremental counterpart of ``audio.Analyzer``.
+
+    Receives mono float32 chunks in order and keeps only bounded state, so
+    memory does not grow with recording length.
+    """
+
+    name: str
+
+    def start(self, frame_rate: int) -> None: ...
+
+    def feed(self, samples: np.ndarray) -> None: ...
+
+    def result(self) -> Any: ...
+
+
+class StreamingDuration:
+    name = "duration"
+
+    def start(self, frame_rate: int) -> None:
+        self.frame_rate = frame_rate
+        self.frames = 0
+
+    def feed(self, samples: np.ndarray) -> None:
+        self.frames += len(samples)
+
+    def result(self) -> int:
+        return self.frames // self.frame_rate if self.frame_rate else 0
+
+
+class StreamingTranscriptSample:
+    name = "transcript"
+
+    def __init__(self, sample_ms: int = TRANSCRIPT_SAMPLE_MS) -> None:
+        self.sample_ms = sample_ms
+
+    def start(self, frame_rate: int) -> None:
+        self.limit = frame_rate * self.sample_ms // 1000
+        self.frame_rate = frame_rate
+        self.frames = 0
+
+    def feed(self, samples: np.ndarray) -> None:
+        self.frames = min(self.limit, self.frames + len(samples))
+
+    def result(self) -> str:
+        sample_ms = self.frames * 1000 // self.frame_rate if self.frame_rate else 0
+        return f"Detected speech fragment: {sample_ms}ms sample"
+
+
+class StreamingSilence:
+    """Chunked version of ``silence.detect_silence``; yields identical intervals."""
+
+    name = "silence"
+
+    def __init__(
+        self,
+        *,
+        threshold_db: float | None = None,
+        min_silence_ms: int | None = None,
+        padding_ms: int | None = None,
+        frame_ms: int | None = None,
+    ) -> None:
+        self.params = silence_params(
+            threshold_db=threshold_db,
+            min_silence_ms=min_silence_ms,
+            padding_ms=padding_ms,
+            frame_ms=frame_ms,
+        )
+
+    def start(self, frame_rate: int) -> None:
+        self.frame_rate = frame_rate
+        self.frame_len = frame_length(frame_rate, self.params.frame_ms)
+        self.total = 0  # samples seen
+        self.done = 0  # samples already classified
+        self.rest = np.empty(0, dtype=np.float32)
+        self.open_start: int | None = None
+        self.starts: List[np.ndarray] = []
+        self.ends: List[np.ndarray] = []
+
+    def feed(self, samples: np.ndarray) -> None:
+        self.total += len(samples)
+        if self.rest.size:
+            samples = np.concatenate((self.rest, samples))
+        full = len(samples) - len(samples) % self.frame_len
+        self.rest = samples[full:].copy()
+        if full:
+            db = frame_rms_db(samples[:full], self.frame_len)
+            self._push(db < self.params.threshold_db, full)
+
+    def runs(self) -> tuple[np.ndarray, np.ndarray]:
+        """Flush pending samples; unfiltered silent runs as (start, end) sample offsets."""
+        if self.rest.size:
+            db = frame_rms_db(self.rest, self.frame_len)
+            self._push(db < self.params.threshold_db, self.rest.size)
+            self.rest = np.empty(0, dtype=np.float32)
+        if self.open_start is not None:
+            self.starts.append(np.array([self.open_start]))
+            self.ends.append(np.array([self.total]))
+            self.open_start = None
+        if not self.starts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(self.starts), np.concatenate(self.ends)
+
+    def result(self) -> List[Dict[str, int]]:
+        starts, ends = self.runs()
+        if not starts.size or not self.frame_rate:
+            return []
+        return intervals_ms(
+            starts,
+            ends,
+            self.frame_rate,
+            min_silence_ms=self.params.min_silence_ms,
+            padding_ms=self.params.padding_ms,
+        )
+
+    def _push(self, silent: np.ndarray, n_samples: int) -> None:
+        starts, ends = silent_runs(silent)
+        base = self.done
+        starts = base + starts * self.frame_len
+        ends = np.minimum(base + ends * self.frame_len, base + n_samples)
+        self.done = base + n_samples
+        if self.open_start is not None:
+            if starts.size and starts[0] == base:
+                starts[0] = self.open_start
+            else:
+                self.starts.append(np.array([self.open_start]))
+                self.ends.append(np.array([base]))
+            self.open_start = None
+        if ends.size and ends[-1] == self.done:
+            self.open_start = int(starts[-1])
+            starts, ends = starts[:-1], ends[:-1]
+        if starts.size:
+            self.starts.append(starts)
+            self.ends.append(ends)
+
+
+class StreamingLevels:
+    """Overall peak and RMS level in dBFS."""
+
+    name = "levels"
+
+    def start(self, frame_rate: int) -> None:
+        self.peak = 0.0
+        self.energy = 0.0
+        self.frames = 0
+
+    def feed(self, samples: np.ndarray) -> None:
+        if not samples.size:
+            return
+        self.peak = max(self.peak, float(np.max(np.abs(samples))))
+        self.energy += float(np.dot(samples, samples))
+        self.frames += len(samples)
+
+    def result(self) -> Dict[str, float]:
+        rms = (self.energy / self.frames) ** 0.5 if self.frames else 0.0
+        return {"peak_dbfs": _dbfs(self.peak), "rms_dbfs": _dbfs(rms)}
+
+
+def default_streaming_analyzers() -> list[StreamingAnalyzer]:
+    # Streaming analyzers are stateful: build a fresh set per recording
+    return [StreamingDuration(), StreamingTranscriptSample(), StreamingSilence(), StreamingLevels()]
+
+
+def iter_pcm(
+    path: Path,
+    chunk_frames: int | None = None,
+    *,
+    start: int = 0,
+    end: int | None = None,
+) -> tuple[int, Iterator[np.ndarray]]:
+    """Open ``path`` for chunked reading; returns (frame_rate, mono float32 chunks).
+
+    Plain PCM WAV files are read with ``wave``; everything else is decoded by
+    an ffmpeg subprocess to mono s16le on stdout. ``start``/``end`` select a
+    range in output samples (``end=None`` reads to the end of the file).
+    """
+    chunk_frames = chunk_frames or settings.AUDIO_STREAM_CHUNK_FRAMES
+    wav = _open_wav(path)
+    if wav is not None:
+        return wav.getframerate(), _wav_chunks(wav, chunk_frames, start, end)
+    return FFMPEG_SAMPLE_RATE, _ffmpeg_chunks(path, chunk_frames, start, end)
+
+
+def pcm_layout(path: Path) -> tuple[int, int | None]:
+    """Sample rate ``iter_pcm`` will produce and the total sample count, if known."""
+    wav = _open_wav(path)
+    if wav is None:
+        return FFMPEG_SAMPLE_RATE, None
+    with wav:
+        return wav.getframerate(), wav.getnframes()
+
+
+def analyze_stream(
+    path: Path,
+    analyzers: Sequence[StreamingAnalyzer] | None = None,
+    *,
+    chunk_frames: int | None = None,
+) -> Dict[str, Any]:
+    """Single streaming pass over ``path`` with bounded memory.
+
+    Time spent waiting for the next chunk counts as ``decode``; each
+    analyzer's ``feed``/``result`` time is reported under its name.
+    """
+    analyzers = default_streaming_analyzers() if analyzers is None else analyzers
+    timings = dict.fromkeys(["decode", *(a.name for a in analyzers)], 0.0)
+    clock = time.perf_counter
+    t0 = clock()
+    frame_rate, chunks = iter_pcm(path, chunk_frames)
+    for a in analyzers:
+        a.start(frame_rate)
+    for chunk in chunks:
+        t1 = clock()
+        timings["decode"] += t1 - t0
+        t0 = t1
+        for a in analyzers:
+            a.feed(chunk)
+            t0 = clock()
+            timings[a.name] += t0 - t1
+            t1 = t0
+    timings["decode"] += clock() - t0
+    out = {}
+    for a in analyzers:
+        t0 = clock()
+        out[a.name] = a.result()
+        timings[a.name] += clock() - t0
+    observe_stages(timings)
+    return out
+
+
+def should_stream(path: Path) -> bool:
+    if not settings.AUDIO_STREAMING:
+        return False
+    try:
+        return path.stat().st_size >= settings.AUDIO_STREAM_MIN_BYTES
+    except OSError:
+        return False
+
+
+def _open_wav(path: Path) -> wave.Wave_read | None:
+    if path.suffix.lower() != ".wav":
+        return None
+    try:
+        wav = wave.open(str(path), "rb")
+    except (wave.Error, EOFError):
+        return None  # e.g. float/extensible WAV: let ffmpeg handle it
+    if wav.getsampwidth() not in _WAV_WIDTHS:
+        wav.close()
+        return None
+    return wav
+
+
+def _wav_chunks(
+    wav: wave.Wave_read, chunk_frames: int, start: int = 0, end: int | None = None
+) -> Iterator[np.ndarray]:
+    width, channels = wav.getsampwidth(), wav.getnchannels()
+    with wav:
+        if start:
+            wav.setpos(min(start, wav.getnframes()))
+        left = None if end is None else max(0, end - start)
+        while left is None or left > 0:
+            n = chunk_frames if left is None else min(chunk_frames, left)
+            data = wav.readframes(n)
+            if not data:
+                break
+            if left is not None:
+                left -= len(data) // (width * channels)
+            yield pcm_to_mono(data, width, channels)
+
+
+def _ffmpeg_chunks(
+    path: Path, chunk_frames: int, start: int = 0, end: int | None = None
+) -> Iterator[np.ndarray]:
+    cmd = ["ffmpeg", "-nostdin", "-v", "error"]
+    if start:
+        # Input seeking is sample accurate when decoding (ffmpeg -accurate_seek)
+        cmd += ["-ss", f"{start / FFMPEG_SAMPLE_RATE:.6f}"]
+    cmd += ["-i", str(path)]
+    if end is not None:
+        cmd += ["-t", f"{max(0, end - start) / FFMPEG_SAMPLE_RATE:.6f}"]
+    cmd += ["-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(FFMPEG_SAMPLE_RATE), "-"]
+    # stderr goes to a temp file: a damaged file can make ffmpeg write more
+    # than a pipe holds, and a PIPE read only after stdout would deadlock
+    with tempfile.TemporaryFile() as errfile:
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errfile)
+        except FileNotFoundError as exc:
+            raise AudioStreamError("ffmpeg_not_found") from exc
+        assert proc.stdout is not None
+        try:
+            while True:
+                data = proc.stdout.read(chunk_frames * 2)
+                if not data:
+                    break
+                yield pcm_to_mono(data[: len(data) - len(data) % 2], 2, 1)
+            if proc.wait() != 0:
+                raise AudioStreamError(_tail(errfile) or "ffmpeg_failed")
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+
+def _tail(f, limit: int = FFMPEG_ERROR_TAIL) -> str:
+    """Last ``limit`` bytes of ``f`` as text (ffmpeg's final messages)."""
+    f.seek(0, os.SEEK_END)
+    f.seek(max(0, f.tell() - limit))
+    return f.read().decode(errors="replace").strip()
+
+
+def _dbfs(value: float) -> float:
+    return round(20.0 * float(np.log10(max(value, 1e-10))), 2)
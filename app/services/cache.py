@@ -0,0 +1,216 @@
+from __future__ import annotations
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+from ..core.config import settings
+from ..core.redis import RedisError, WatchError, get_redis, redis_available
+from ..models import CallStatus
+
+INVALIDATE_CHANNEL = "calls:invalidate"
+_KEY_PREFIX = "call:"
+# Per-call invalidation counter shared by all processes; outlives any read
+_VERSION_PREFIX = "call:ver:"
+_VERSION_TTL_SEC = 3600
+_DATETIME_FIELDS = ("started_at", "created_at", "updated_at")
+
+
+class LRUCache:
+    """Bounded in-process LRU with a per-entry TTL (monotonic clock)."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires, value = item
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: float | None = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CallCache:
+    """Read-through cache for ``get_call`` DTOs: local LRU, then optional Redis.
+
+    Writers call ``invalidate`` after changing a call; it evicts locally,
+    deletes the Redis key and publishes the id so other API processes evict
+    their local copy too (see ``listen``). Without Redis, entries written by
+    other processes (e.g. Celery workers) age out after ``CALL_CACHE_TTL_SEC``.
+
+    A reader takes ``version`` before reading the database and passes it to
+    ``set``: the write is skipped if the call was invalidated in between, in
+    this process (local counter) or any other (Redis counter, checked and
+    written under WATCH).
+    """
+
+    def __init__(self) -> None:
+        self.local = LRUCache(settings.CALL_CACHE_SIZE, settings.CALL_CACHE_TTL_SEC)
+        self.stats = {"hits_local": 0, "hits_redis": 0, "misses": 0, "invalidations": 0, "redis_errors": 0}
+        # Bumped on invalidation; a reader that raced with a writer skips its set
+        self._versions: dict[uuid.UUID, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.CALL_CACHE_ENABLED
+
+    @property
+    def redis_enabled(self) -> bool:
+        return settings.CALL_CACHE_REDIS and redis_available()
+
+    async def version(self, call_id: uuid.UUID) -> tuple[int, int | None]:
+        """Local and Redis invalidation counters; Redis is ``None`` when unreadable."""
+        shared = None
+        if self.redis_enabled:
+            try:
+                shared = int(await get_redis().get(_VERSION_PREFIX + str(call_id)) or 0)
+            except (RedisError, OSError):
+                self.stats["redis_errors"] += 1
+        return self._local_version(call_id), shared
+
+    def _local_version(self, call_id: uuid.UUID) -> int:
+        return self._versions.get(call_id, 0)
+
+    async def get(self, call_id: uuid.UUID) -> dict | None:
+        data = self.local.get(call_id)
+        if data is not None:
+            self.stats["hits_local"] += 1
+            return data
+        if self.redis_enabled:
+            try:
+                raw = await get_redis().get(_KEY_PREFIX + str(call_id))
+            except (RedisError, OSError):
+                self.stats["redis_errors"] += 1
+                raw = None
+            if raw is not None:
+                data = _loads(raw)
+                self.local.set(call_id, data)
+                self.stats["hits_redis"] += 1
+                return data
+        self.stats["misses"] += 1
+        return None
+
+    async def set(
+        self, call_id: uuid.UUID, data: dict, *, version: tuple[int, int | None] | None = None
+    ) -> None:
+        if version is not None and version[0] != self._local_version(call_id):
+            return
+        self.local.set(call_id, data)
+        if not self.redis_enabled or (version is not None and version[1] is None):
+            return
+        key = _KEY_PREFIX + str(call_id)
+        try:
+            if version is None:
+                await get_redis().set(key, _dumps(data), ex=settings.CALL_CACHE_REDIS_TTL_SEC)
+            elif not await self._set_if_current(call_id, key, _dumps(data), version[1]):
+                self.local.delete(call_id)
+        except WatchError:
+            self.local.delete(call_id)  # invalidated by another process meanwhile
+        except (RedisError, OSError):
+            self.stats["redis_errors"] += 1
+
+    async def _set_if_current(self, call_id: uuid.UUID, key: str, raw: str, seen: int) -> bool:
+        """SET unless the call was invalidated since the reader took ``seen``."""
+        async with get_redis().pipeline(transaction=True) as pipe:
+            await pipe.watch(_VERSION_PREFIX + str(call_id))
+            if int(await pipe.get(_VERSION_PREFIX + str(call_id)) or 0) != seen:
+                return False
+            pipe.multi()
+            pipe.set(key, raw, ex=settings.CALL_CACHE_REDIS_TTL_SEC)
+            await pipe.execute()
+        return True
+
+    async def invalidate(self, call_id: uuid.UUID) -> None:
+        self.evict(call_id)
+        if self.redis_enabled:
+            try:
+                client = get_redis()
+                async with client.pipeline(transaction=True) as pipe:
+                    pipe.incr(_VERSION_PREFIX + str(call_id))
+                    pipe.expire(_VERSION_PREFIX + str(call_id), _VERSION_TTL_SEC)
+                    pipe.delete(_KEY_PREFIX + str(call_id))
+                    await pipe.execute()
+                await client.publish(INVALIDATE_CHANNEL, str(call_id))
+            except (RedisError, OSError):
+                self.stats["redis_errors"] += 1
+
+    def evict(self, call_id: uuid.UUID) -> None:
+        self._versions[call_id] = self._local_version(call_id) + 1
+        if len(self._versions) > settings.CALL_CACHE_SIZE:
+            self._versions.clear()  # only in-flight reads care; bound memory
+        self.local.delete(call_id)
+        self.stats["invalidations"] += 1
+
+    async def listen(self) -> None:
+        """Evict local entries invalidated by other processes (runs until cancelled)."""
+        if not self.redis_enabled:
+            return
+        while True:
+            try:
+                pubsub = get_redis().pubsub()
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                async for msg in pubsub.listen():
+                    if msg.get("type") != "message":
+                        continue
+                    try:
+                        call_id = uuid.UUID(_text(msg["data"]))
+                    except ValueError:
+                        continue
+                    self._versions[call_id] = self._local_version(call_id) + 1
+                    self.local.delete(call_id)
+            except (RedisError, OSError):
+                self.stats["redis_errors"] += 1
+                # Drop everything we might have missed while disconnected
+                self.local = LRUCache(settings.CALL_CACHE_SIZE, settings.CALL_CACHE_TTL_SEC)
+                await asyncio.sleep(1.0)
+
+    def snapshot(self) -> dict[str, int]:
+        return {**self.stats, "size_local": len(self.local)}
+
+
+def _dumps(data: dict) -> str:
+    out = dict(data)
+    out["id"] = str(data["id"])
+    status = data.get("status")
+    out["status"] = status.value if hasattr(status, "value") else status
+    for f in _DATETIME_FIELDS:
+        if data.get(f) is not None:
+            out[f] = data[f].isoformat()
+    return json.dumps(out)
+
+
+def _loads(raw: bytes | str) -> dict:
+    data = json.loads(raw)
+    data["id"] = uuid.UUID(data["id"])
+    data["status"] = CallStatus(data["status"])
+    for f in _DATETIME_FIELDS:
+        if data.get(f) is not None:
+            data[f] = datetime.fromisoformat(data[f])
+    return data
+
+
+def _text(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+call_cache = CallCache()
@@ -1,8 +1,25 @@
 from __future__ import annotations
+import base64
+import binascii
+import json
 import uuid
-from sqlalchemy import select, or_, func
+from datetime import datetime
+from enum import StrEnum
+from sqlalchemy import and_, insert, select, func, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..models import Call
+from ..models import Call, CallStatus
+from .cache import call_cache
+from .phone_search import plan_search
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class TotalMode(StrEnum):
+    exact = "exact"
+    estimate = "estimate"  # planner row estimate, no extra scan
+    none = "none"
 
 
 FIELDS = (
@@ -35,6 +52,44 @@ async def create_call(session: AsyncSession, *, caller: str, receiver: str, star
     return data
 
 
+async def bulk_create_calls(session: AsyncSession, rows: list[dict]) -> list[dict]:
+    """Insert many calls with one multi-row INSERT ... RETURNING and one commit.
+
+    ``rows`` hold caller/receiver/started_at; results come back in input order.
+    """
+    if not rows:
+        return []
+    now = datetime.utcnow()
+    values = [
+        {
+            "id": uuid.uuid4(),
+            "caller": r["caller"],
+            "receiver": r["receiver"],
+            "started_at": r["started_at"],
+            "status": CallStatus.created,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for r in rows
+    ]
+    stmt = insert(Call).returning(*FIELDS, sort_by_parameter_order=True)
+    res = await session.execute(stmt, values)
+    out = [
+        {
+            "id": r.id,
+            "caller": r.caller,
+            "receiver": r.receiver,
+            "started_at": r.started_at,
+            "status": r.status,
+            "created_at": r.created_at,
+            "updated_at": r.updated_at,
+        }
+        for r in res.all()
+    ]
+    await session.commit()
+    return out
+
+
 async def get_call(session: AsyncSession, call_id: uuid.UUID) -> dict | None:
     stmt = select(*FIELDS).where(Call.id == call_id)
     res = await session.execute(stmt)
@@ -52,15 +107,69 @@ async def get_call(session: AsyncSession, call_id: uuid.UUID) -> dict | None:
     }
 
 
-async def search_calls(session: AsyncSession, *, query: str, limit: int = 50, offset: int = 0) -> tuple[int, list[dict]]:
-    q = f"%{query}%"
-    where = or_(Call.caller.ilike(q), Call.receiver.ilike(q))
-    total_stmt = select(func.count()).select_from(Call).where(where)
-    total = (await session.execute(total_stmt)).scalar_one()
+async def get_call_cached(session: AsyncSession, call_id: uuid.UUID) -> dict | None:
+    """Read-through ``get_call``; writers invalidate via ``call_cache.invalidate``."""
+    if not call_cache.enabled:
+        return await get_call(session, call_id)
+    data = await call_cache.get(call_id)
+    if data is not None:
+        return data
+    version = await call_cache.version(call_id)
+    data = await get_call(session, call_id)
+    if data is not None:
+        await call_cache.set(call_id, data, version=version)
+    return data
+
+
+async def search_calls(
+    session: AsyncSession,
+    *,
+    query: str,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+    total_mode: TotalMode = TotalMode.exact,
+    started_from: datetime | None = None,
+    started_to: datetime | None = None,
+) -> tuple[int | None, list[dict], str | None]:
+    """Search calls by phone number, newest first.
+
+    With ``cursor`` the page starts after the (created_at, id) it encodes and
+    ``offset`` is ignored; otherwise classic offset paging is used. Returns
+    ``(total, items, next_cursor)``; ``total`` is ``None`` for ``TotalMode.none``.
+    ``started_from``/``started_to`` (``[from, to)`` on started_at) limit the
+    scan, the count and the estimate to the monthly partitions they overlap.
+    """
+    where = and_(plan_search(query).condition(), *started_window(started_from, started_to))
+
+    stmt = select(*FIELDS)
+    # In offset mode the exact total comes from a window count in the same scan
+    window_total = total_mode is TotalMode.exact and cursor is None
+    if window_total:
+        stmt = stmt.add_columns(func.count().over().label("total"))
+    if cursor is not None:
+        created_at, call_id = decode_cursor(cursor)
+        stmt = stmt.where(where, tuple_(Call.created_at, Call.id) < tuple_(created_at, call_id))
+    else:
+        stmt = stmt.where(where).offset(offset)
+    # One extra row tells whether a next page exists
+    stmt = stmt.order_by(Call.created_at.desc(), Call.id.desc()).limit(limit + 1)
+    rows = (await session.execute(stmt)).all()
+    page, more = rows[:limit], len(rows) > limit
+
+    total: int | None
+    if total_mode is TotalMode.none:
+        total = None
+    elif total_mode is TotalMode.estimate:
+        total = await estimate_count(session, select(Call.id).where(where))
+    elif window_total and rows:
+        total = int(rows[0].total)
+    elif window_total and offset == 0:
+        total = 0
+    else:
+        total_stmt = select(func.count()).select_from(Call).where(where)
+        total = int((await session.execute(total_stmt)).scalar_one())
 
-    stmt = select(*FIELDS).where(where).order_by(Call.created_at.desc()).limit(limit).offset(offset)
-    res = await session.execute(stmt)
-    rows = res.all()
     items = [
         {
             "id": r.id,
@@ -71,6 +180,42 @@ async def search_calls(session: AsyncSession, *, query: str, limit: int = 50, of
             "created_at": r.created_at,
             "updated_at": r.updated_at,
         }
-        for r in rows
+        for r in page
     ]
-    return int(total), items
+    next_cursor = encode_cursor(page[-1].created_at, page[-1].id) if more else None
+    return total, items, next_cursor
+
+
+def started_window(started_from: datetime | None, started_to: datetime | None) -> list:
+    """Conditions on the partition key; constants, so the planner prunes partitions."""
+    conds = []
+    if started_from is not None:
+        conds.append(Call.started_at >= started_from)
+    if started_to is not None:
+        conds.append(Call.started_at < started_to)
+    return conds
+
+
+async def estimate_count(session: AsyncSession, stmt) -> int:
+    """Row estimate from the planner (EXPLAIN), without executing ``stmt``."""
+    # Render with the session's own dialect so LIKE patterns are not re-escaped
+    sql = stmt.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    res = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = res.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def encode_cursor(created_at: datetime, call_id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(call_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, call_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(call_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor from None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+import json
+import logging
+import uuid
+from typing import Any
+from ..core.redis import RedisError, get_redis, redis_available
+from ..models import CallStatus
+
+log = logging.getLogger(__name__)
+
+STATUS_CHANNEL_PREFIX = "calls:status:"
+
+
+def status_channel(call_id: uuid.UUID) -> str:
+    return f"{STATUS_CHANNEL_PREFIX}{call_id}"
+
+
+async def publish_status(call_id: uuid.UUID, status: CallStatus) -> None:
+    """Announce a status transition; best effort, never fails the caller."""
+    if not redis_available():
+        return
+    payload = json.dumps({"call_id": str(call_id), "status": status.value})
+    try:
+        await get_redis().publish(status_channel(call_id), payload)
+    except (RedisError, OSError):
+        log.warning("status publish failed for call %s", call_id, exc_info=True)
+
+
+class StatusSubscription:
+    """Redis pub/sub subscription to status transitions of a set of calls.
+
+    Subscribe before reading the current state from the DB so no transition
+    that happens in between is lost.
+    """
+
+    def __init__(self, call_ids: list[uuid.UUID]) -> None:
+        self.call_ids = call_ids
+        self._pubsub: Any = None
+
+    async def __aenter__(self) -> "StatusSubscription":
+        self._pubsub = get_redis().pubsub()
+        await self._pubsub.subscribe(*(status_channel(c) for c in self.call_ids))
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is None:
+            return
+        try:
+            await pubsub.unsubscribe()
+        finally:
+            await pubsub.aclose()
+
+    async def next_event(self, timeout: float) -> dict | None:
+        """Next status event, or ``None`` if nothing arrived within ``timeout``."""
+        msg = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if msg is None or msg.get("type") != "message":
+            return None
+        return json.loads(msg["data"])
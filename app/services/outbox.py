@@ -0,0 +1,95 @@
+from __future__ import annotations
+from datetime import timedelta
+from typing import Any, Dict, List
+from sqlalchemy import JSON, delete, exists, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import CTE
+from ..core import tracing
+from ..core.config import settings
+from ..models import Call, CallStatus, Outbox
+
+# Transactional outbox: a task is stored in the same transaction as the state
+# change that needs it, and the relay (tasks.relay_outbox, scheduled by beat,
+# run by the QUEUE_OUTBOX worker) publishes pending rows; tasks.sweep_outbox
+# re-sends stuck ones and purges. Publishing is at-least-once: a row is marked
+# dispatched only in the transaction that published it, so tasks must be
+# idempotent (process_recording is: it overwrites the same result).
+
+
+def outbox_message(task: str, args: List[Any], **options: Any) -> Dict[str, Any]:
+    """Task name, args and ``send_task`` options; keeps the caller's trace context."""
+    headers: Dict[str, str] = {}
+    tracing.inject(headers)
+    if headers:
+        options["headers"] = headers
+    return {"task": task, "args": args, "options": options}
+
+
+def enqueue_from(rows: CTE, message: Dict[str, Any]):
+    """``INSERT INTO outbox ... SELECT`` one row per ``call_id`` produced by ``rows``.
+
+    Used as a CTE so the task is only queued when the guarded change happened.
+    """
+    src = select(
+        rows.c.call_id,
+        literal(message["task"]),
+        literal(message["args"], JSON),
+        literal(message["options"], JSON),
+    )
+    return insert(Outbox).from_select(["call_id", "task", "args", "options"], src)
+
+
+async def claim_batch(session: AsyncSession, limit: int) -> List[Dict[str, Any]]:
+    """Mark up to ``limit`` pending rows dispatched and return them (oldest first).
+
+    ``FOR UPDATE SKIP LOCKED`` lets several relays run without publishing a
+    row twice; the caller publishes, then commits (or rolls back on failure).
+    """
+    pending = (
+        select(Outbox.id)
+        .where(Outbox.dispatched_at.is_(None))
+        .order_by(Outbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    res = await session.execute(
+        update(Outbox)
+        .where(Outbox.id.in_(pending.scalar_subquery()))
+        .values(dispatched_at=func.now(), attempts=Outbox.attempts + 1)
+        .returning(Outbox.id, Outbox.task, Outbox.args, Outbox.options, Outbox.created_at),
+        execution_options={"synchronize_session": False},
+    )
+    return sorted((dict(r._mapping) for r in res), key=lambda r: r["id"])
+
+
+async def requeue_stuck(session: AsyncSession) -> int:
+    """Re-publish tasks whose call is still ``processing`` long after dispatch.
+
+    Covers tasks lost by the broker or by a crashed worker; gives up after
+    ``OUTBOX_MAX_ATTEMPTS`` (the row stays for inspection).
+    """
+    cutoff = func.now() - timedelta(seconds=settings.OUTBOX_REDISPATCH_SEC)
+    processing = exists().where(Call.id == Outbox.call_id, Call.status == CallStatus.processing)
+    res = await session.execute(
+        update(Outbox)
+        .where(
+            Outbox.dispatched_at < cutoff,
+            Outbox.attempts < settings.OUTBOX_MAX_ATTEMPTS,
+            processing,
+        )
+        .values(dispatched_at=None),
+        execution_options={"synchronize_session": False},
+    )
+    await session.commit()
+    return res.rowcount or 0
+
+
+async def purge_done(session: AsyncSession) -> int:
+    """Delete dispatched rows whose call has left ``processing`` (or is gone)."""
+    processing = exists().where(Call.id == Outbox.call_id, Call.status == CallStatus.processing)
+    res = await session.execute(
+        delete(Outbox).where(Outbox.dispatched_at.is_not(None), ~processing),
+        execution_options={"synchronize_session": False},
+    )
+    await session.commit()
+    return res.rowcount or 0
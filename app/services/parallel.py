@@ -0,0 +1,105 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+import numpy as np
+from ..core.config import settings
+from .audio import TRANSCRIPT_SAMPLE_MS
+from .audio_stream import StreamingLevels, StreamingSilence, iter_pcm, pcm_layout
+from .probe import ProbeError, probe
+from .silence import frame_length, intervals_ms, silence_params
+
+# Long recordings are cut into segments analysed by separate tasks (see
+# tasks.analyze_segment) and merged back into the usual analysis result.
+
+
+def plan_segments(path: Path) -> list[tuple[int, int | None]] | None:
+    """Sample ranges ``[(start, end), ...]`` for a parallel run, or ``None``.
+
+    ``None`` means the file should be analysed in one pass: parallel analysis
+    is disabled, the recording is shorter than ``PARALLEL_MIN_SEC`` or its
+    headers cannot be read. Boundaries fall on the silence frame grid, so each
+    segment classifies exactly the frames a serial pass would; the last range
+    is open-ended when the exact length is only known after decoding.
+    """
+    if not settings.PARALLEL_ANALYSIS:
+        return None
+    try:
+        info = probe(path, decode_fallback=False)
+    except (ProbeError, OSError):
+        return None
+    if info.duration < settings.PARALLEL_MIN_SEC:
+        return None
+    frame_rate, total = pcm_layout(path)
+    frame_len = frame_length(frame_rate, silence_params().frame_ms)
+    seg_len = max(1, int(settings.PARALLEL_SEGMENT_SEC * frame_rate) // frame_len) * frame_len
+    known = total if total is not None else int(info.duration * frame_rate)
+    bounds = list(range(0, known, seg_len))
+    if len(bounds) < 2:
+        return None
+    ranges: list[tuple[int, int | None]] = [(s, s + seg_len) for s in bounds[:-1]]
+    ranges.append((bounds[-1], total))
+    return ranges
+
+
+def analyze_segment(path: Path, start: int, end: int | None) -> Dict[str, Any]:
+    """Partial analysis of samples ``[start, end)``; JSON-serialisable for Celery."""
+    frame_rate, chunks = iter_pcm(path, start=start, end=end)
+    silence, levels = StreamingSilence(), StreamingLevels()
+    silence.start(frame_rate)
+    levels.start(frame_rate)
+    for chunk in chunks:
+        silence.feed(chunk)
+        levels.feed(chunk)
+    starts, ends = silence.runs()
+    return {
+        "start": start,
+        "frame_rate": frame_rate,
+        "frames": silence.total,
+        "runs": np.stack((starts + start, ends + start), axis=1).tolist(),
+        "peak": levels.peak,
+        "energy": levels.energy,
+    }
+
+
+def merge_segments(parts: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine ``analyze_segment`` results into an ``analyze_stream``-style dict.
+
+    Durations and level sums are added up. Silent runs that end at one
+    segment boundary and continue at the next are joined before the minimum
+    length and padding are applied, so a pause is not lost or split in two
+    by the cut.
+    """
+    parts = sorted(parts, key=lambda p: p["start"])
+    frame_rate = parts[0]["frame_rate"] if parts else 0
+    frames = sum(p["frames"] for p in parts)
+    runs = [r for p in parts for r in p["runs"]]
+    silence: List[Dict[str, int]] = []
+    if runs and frame_rate:
+        arr = np.asarray(runs, dtype=np.int64)
+        starts, ends = arr[:, 0], arr[:, 1]
+        # Runs inside a segment are at least one frame apart; seeked decodes may
+        # be off by a few samples at a boundary, so join gaps under half a frame
+        params = silence_params()
+        tolerance = frame_length(frame_rate, params.frame_ms) // 2
+        new_run = np.concatenate(([True], starts[1:] - ends[:-1] > tolerance))
+        group_ends = np.append(np.flatnonzero(new_run)[1:] - 1, len(ends) - 1)
+        silence = intervals_ms(
+            starts[new_run],
+            ends[group_ends],
+            frame_rate,
+            min_silence_ms=params.min_silence_ms,
+            padding_ms=params.padding_ms,
+        )
+    sample_frames = min(frames, frame_rate * TRANSCRIPT_SAMPLE_MS // 1000)
+    sample_ms = sample_frames * 1000 // frame_rate if frame_rate else 0
+    levels = StreamingLevels()
+    levels.start(frame_rate)
+    levels.peak = max((p["peak"] for p in parts), default=0.0)
+    levels.energy = sum(p["energy"] for p in parts)
+    levels.frames = frames
+    return {
+        "duration": frames // frame_rate if frame_rate else 0,
+        "transcript": f"Detected speech fragment: {sample_ms}ms sample",
+        "silence": silence,
+        "levels": levels.result(),
+    }
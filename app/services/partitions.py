@@ -0,0 +1,272 @@
+from __future__ import annotations
+import asyncio
+import io
+import json
+import logging
+import re
+import tarfile
+import time
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, List
+from sqlalchemy import column, delete, select, table, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.config import settings
+from ..models import Call, Outbox, Recording
+from . import peaks
+from .storage import StorageBackend, is_content_key
+
+log = logging.getLogger(__name__)
+
+# `call` is range-partitioned by month on started_at (migration 20251018_0008):
+# call_y2025m01 holds [2025-01-01, 2025-02-01) UTC, call_default everything
+# outside the monthly ranges. Queries that filter on started_at only touch the
+# matching partitions; an expired month is detached (metadata only, no
+# DELETE, nothing to vacuum), archived and dropped.
+_NAME = re.compile(r"^call_y(\d{4})m(\d{2})$")
+DEFAULT_PARTITION = "call_default"
+_DELETE_CHUNK = 1000
+_ARCHIVE_PAGE = 1000
+
+
+def month_start(ts: datetime) -> datetime:
+    ts = ts.astimezone(timezone.utc)
+    return datetime(ts.year, ts.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, n: int) -> datetime:
+    years, m = divmod(month.month - 1 + n, 12)
+    return month.replace(year=month.year + years, month=m + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"call_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> datetime | None:
+    m = _NAME.match(name)
+    return datetime(int(m[1]), int(m[2]), 1, tzinfo=timezone.utc) if m else None
+
+
+async def attached_partitions(session: AsyncSession) -> List[str]:
+    res = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'call'::regclass"
+        )
+    )
+    return sorted(n for n in res.scalars() if partition_month(n))
+
+
+async def detached_partitions(session: AsyncSession) -> List[str]:
+    """Monthly tables no longer attached to ``call``: detached, not archived yet."""
+    res = await session.execute(
+        text(
+            "SELECT relname FROM pg_class WHERE relkind = 'r' AND NOT relispartition "
+            "AND relnamespace = current_schema()::regnamespace"
+        )
+    )
+    return sorted(n for n in res.scalars() if partition_month(n))
+
+
+async def ensure_partitions(session: AsyncSession, now: datetime | None = None) -> List[str]:
+    """Create the partitions of this month and ``CALL_PARTITIONS_AHEAD`` following ones.
+
+    Each month is its own transaction: one that cannot be created (lock
+    timeout, say) is logged and retried on the next run, the others and the
+    rest of the maintenance still go ahead.
+    """
+    first = month_start(now or datetime.now(timezone.utc))
+    existing = set(await attached_partitions(session))
+    created = []
+    for i in range(settings.CALL_PARTITIONS_AHEAD + 1):
+        month = add_months(first, i)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        try:
+            await _create_partition(session, name, month)
+            await session.commit()
+        except DBAPIError:
+            await session.rollback()
+            log.warning("could not create partition %s", name, exc_info=True)
+            continue
+        created.append(name)
+    return created
+
+
+async def _create_partition(session: AsyncSession, name: str, month: datetime) -> None:
+    # Creating a partition scans call_default under an exclusive lock on
+    # `call`: fail fast rather than queue behind long queries
+    await session.execute(text("SET LOCAL lock_timeout = '5s'"))
+    lo, hi = month.isoformat(), add_months(month, 1).isoformat()
+    create = (
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF call "
+        f"FOR VALUES FROM ('{lo}') TO ('{hi}')"
+    )
+    in_range = f"started_at >= '{lo}' AND started_at < '{hi}'"
+    res = await session.execute(text(f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range} LIMIT 1"))
+    if res.first() is None:
+        await session.execute(text(create))
+        return
+    # Calls that landed in the default partition before their month existed
+    # would make CREATE fail: move them into the new partition, all in this
+    # transaction so readers never see them missing
+    cols = ", ".join(c.name for c in Call.__table__.c if not c.computed)
+    await session.execute(text(f"ALTER TABLE call DETACH PARTITION {DEFAULT_PARTITION}"))
+    await session.execute(text(create))
+    await session.execute(
+        text(f"INSERT INTO call ({cols}) SELECT {cols} FROM {DEFAULT_PARTITION} WHERE {in_range}")
+    )
+    await session.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"))
+    await session.execute(text(f"ALTER TABLE call ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+
+async def detach_expired(session: AsyncSession, now: datetime | None = None) -> List[str]:
+    """Detach months older than ``CALL_RETENTION_MONTHS`` (0 = never)."""
+    if settings.CALL_RETENTION_MONTHS <= 0:
+        return []
+    current = month_start(now or datetime.now(timezone.utc))
+    cutoff = add_months(current, -settings.CALL_RETENTION_MONTHS)
+    detached = []
+    for name in await attached_partitions(session):
+        if add_months(partition_month(name), 1) > cutoff:
+            continue
+        # Needs a short exclusive lock on `call`: fail fast rather than queue
+        # behind long queries (and block everyone queued after us)
+        await session.execute(text("SET LOCAL lock_timeout = '5s'"))
+        await session.execute(text(f"ALTER TABLE call DETACH PARTITION {name}"))
+        await session.commit()
+        detached.append(name)
+    return detached
+
+
+async def archive_partition(
+    session: AsyncSession, name: str, storage: StorageBackend
+) -> Dict[str, Any]:
+    """Export a detached month with its recordings to storage, then drop it.
+
+    The archive (``CALL_ARCHIVE_PREFIX``/YYYY-MM.tar.gz) holds
+    ``calls/NNNNNN.jsonl`` pages (calls with their recording row), each
+    followed by the ``recordings/<key>`` files it references. It is streamed
+    straight into storage page by page, so neither the month nor its audio
+    is ever staged on local disk.
+
+    Recording rows go away with the table. Content-store files are never
+    deleted: an upload of the same bytes reuses the file (and the analysis
+    cache marks it ready) without any coordination with this job, so no
+    check here could rule that out. Only per-call keys (direct uploads,
+    legacy names) nothing else can point to are removed. Safe to rerun: the
+    table is dropped last.
+    """
+    month = partition_month(name)
+    part = table(name, *(column(c.name, c.type) for c in Call.__table__.c))
+    rec = Recording.__table__
+    rec_cols = [rec.c[k].label(f"recording_{k}") for k in rec.c.keys() if k != "call_id"]
+    stmt = (
+        select(*(part.c[c.name] for c in Call.__table__.c if not c.computed), *rec_cols)
+        .outerjoin(rec, rec.c.call_id == part.c.id)
+        .order_by(part.c.id)
+        .limit(_ARCHIVE_PAGE)
+    )
+
+    key = f"{settings.CALL_ARCHIVE_PREFIX}{month:%Y-%m}.tar.gz"
+    calls, missing, keys = 0, 0, set()
+    with storage.open_write(key) as out, tarfile.open(fileobj=out, mode="w|gz") as tar:
+        # Keyset pages: the detached table no longer changes, and no
+        # transaction stays open while the page is being uploaded
+        after = None
+        while True:
+            page = stmt if after is None else stmt.where(part.c.id > after)
+            rows = (await session.execute(page)).all()
+            await session.rollback()
+            if not rows:
+                break
+            items = [_archive_item(row._mapping) for row in rows]
+            jsonl = "".join(_dump(it) for it in items)
+            recs = {it["recording"]["filename"] for it in items if it["recording"] is not None}
+            files = sorted(recs - keys)
+            keys.update(files)
+            member = f"calls/{calls // _ARCHIVE_PAGE:06d}.jsonl"
+            missing += await asyncio.to_thread(
+                _write_page, tar, storage, member, jsonl.encode(), files
+            )
+            calls += len(rows)
+            after = rows[-1].id
+
+    call_ids = select(part.c.id)
+    res = await session.execute(
+        delete(Recording).where(Recording.call_id.in_(call_ids)).returning(Recording.filename),
+        execution_options={"synchronize_session": False},
+    )
+    removed = sorted({k for k in res.scalars() if not is_content_key(k)})
+    await session.execute(
+        delete(Outbox).where(Outbox.call_id.in_(call_ids)),
+        execution_options={"synchronize_session": False},
+    )
+    still_used = set()
+    for i in range(0, len(removed), _DELETE_CHUNK):
+        chunk = removed[i : i + _DELETE_CHUNK]
+        res = await session.execute(select(Recording.filename).where(Recording.filename.in_(chunk)))
+        still_used.update(res.scalars())
+    await session.execute(text(f"DROP TABLE {name}"))
+    await session.commit()
+
+    # After the commit: a crash here leaves orphaned files, never lost rows
+    orphans = [k for k in removed if k not in still_used]
+    await asyncio.to_thread(_delete_files, storage, orphans)
+    return {
+        "partition": name,
+        "archive": key,
+        "calls": calls,
+        "recordings": len(keys),
+        "missing_files": missing,
+        "deleted_files": len(orphans),
+    }
+
+
+def _dump(item: Dict[str, Any]) -> str:
+    return json.dumps(item, default=str, separators=(",", ":")) + "\n"
+
+
+def _archive_item(row) -> Dict[str, Any]:
+    item = {k: v for k, v in row.items() if not k.startswith("recording_")}
+    recording = {k[len("recording_"):]: v for k, v in row.items() if k.startswith("recording_")}
+    if recording["id"] is None:
+        item["recording"] = None
+    else:
+        marks = recording["silence_marks"]
+        recording["silence_marks"] = None if marks is None else marks.hex()  # services/marks.py
+        item["recording"] = recording
+    return item
+
+
+def _write_page(
+    tar: tarfile.TarFile, storage: StorageBackend, name: str, jsonl: bytes, files: List[str]
+) -> int:
+    mtime = int(time.time())
+    _add_member(tar, name, len(jsonl), io.BytesIO(jsonl), mtime)
+    missing = 0
+    for key in files:
+        # Read straight from storage (ranged GETs for S3), no local copy
+        try:
+            size = storage.size(key)
+            src = storage.open(key)
+        except FileNotFoundError:
+            missing += 1
+            continue
+        with src:
+            _add_member(tar, f"recordings/{key}", size, src, mtime)
+    return missing
+
+
+def _add_member(tar: tarfile.TarFile, name: str, size: int, src: BinaryIO, mtime: int) -> None:
+    info = tarfile.TarInfo(name)
+    info.size, info.mtime = size, mtime
+    tar.addfile(info, src)
+
+
+def _delete_files(storage: StorageBackend, keys: List[str]) -> None:
+    for key in keys:
+        storage.delete(key)
+        storage.delete(peaks.peaks_key(key))
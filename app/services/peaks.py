@@ -0,0 +1,188 @@
+from __future__ import annotations
+import struct
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, List
+import numpy as np
+from pydub import AudioSegment
+from ..core.config import settings
+from .audio_stream import iter_pcm
+from .silence import to_mono_float
+from .storage import get_storage
+
+# Waveform peaks: a min/max pyramid stored next to the audio as <key>.peaks.
+#
+#   header  "<4sBBIIQ"  magic, version, levels, sample_rate, samples_per_peak, frames
+#   levels  "<QQ" each  byte offset and bucket count of level 0..n-1
+#   data    int8 (min, max) per bucket; level k covers samples_per_peak * 2**k samples
+MAGIC = b"WPKS"
+VERSION = 1
+MAX_LEVELS = 24
+_HEADER = struct.Struct("<4sBBIIQ")
+_LEVEL = struct.Struct("<QQ")
+
+
+class PeaksError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class PeaksInfo:
+    sample_rate: int
+    samples_per_peak: int  # at level 0
+    frames: int
+    levels: tuple[tuple[int, int], ...]  # (offset, count) per level
+
+    def bucket_samples(self, level: int) -> int:
+        return self.samples_per_peak << level
+
+    def pick_level(self, start_ms: int, end_ms: int, width: int) -> int:
+        """Coarsest level that still has at least ``width`` buckets in the range."""
+        span = max(1, (end_ms - start_ms) * self.sample_rate // 1000)
+        level = 0
+        while level + 1 < len(self.levels) and span // self.bucket_samples(level + 1) >= width:
+            level += 1
+        return level
+
+
+def build_pyramid(mins: np.ndarray, maxs: np.ndarray) -> List[tuple[np.ndarray, np.ndarray]]:
+    """Halve ``mins``/``maxs`` repeatedly (pairwise min/max) down to one bucket."""
+    levels = [(mins, maxs)]
+    while len(mins) > 1 and len(levels) < MAX_LEVELS:
+        even = len(mins) - len(mins) % 2
+        lo = np.minimum(mins[0:even:2], mins[1:even:2])
+        hi = np.maximum(maxs[0:even:2], maxs[1:even:2])
+        if len(mins) % 2:
+            lo, hi = np.append(lo, mins[-1]), np.append(hi, maxs[-1])
+        mins, maxs = lo, hi
+        levels.append((mins, maxs))
+    return levels
+
+
+def encode_peaks(
+    mins: np.ndarray, maxs: np.ndarray, *, sample_rate: int, samples_per_peak: int, frames: int
+) -> bytes:
+    levels = build_pyramid(mins, maxs)
+    offset = _HEADER.size + _LEVEL.size * len(levels)
+    table, data = [], []
+    for lo, hi in levels:
+        table.append(_LEVEL.pack(offset, len(lo)))
+        data.append(np.stack((lo, hi), axis=1).astype(np.int8).tobytes())
+        offset += 2 * len(lo)
+    header = _HEADER.pack(MAGIC, VERSION, len(levels), sample_rate, samples_per_peak, frames)
+    return header + b"".join(table) + b"".join(data)
+
+
+def peaks_from_samples(samples: np.ndarray, frame_rate: int, samples_per_peak: int | None = None) -> bytes:
+    spp = samples_per_peak or settings.PEAKS_SAMPLES_PER_PEAK
+    stream = StreamingPeaks(spp)
+    stream.start(frame_rate)
+    stream.feed(samples)
+    return stream.result()
+
+
+class StreamingPeaks:
+    """``StreamingAnalyzer`` producing the encoded pyramid; keeps int8 level 0 only."""
+
+    name = "peaks"
+
+    def __init__(self, samples_per_peak: int | None = None) -> None:
+        self.samples_per_peak = samples_per_peak or settings.PEAKS_SAMPLES_PER_PEAK
+
+    def start(self, frame_rate: int) -> None:
+        self.frame_rate = frame_rate
+        self.frames = 0
+        self.rest = np.empty(0, dtype=np.float32)
+        self.mins: List[np.ndarray] = []
+        self.maxs: List[np.ndarray] = []
+
+    def feed(self, samples: np.ndarray) -> None:
+        self.frames += len(samples)
+        if self.rest.size:
+            samples = np.concatenate((self.rest, samples))
+        full = len(samples) - len(samples) % self.samples_per_peak
+        self.rest = samples[full:].copy()
+        if full:
+            buckets = samples[:full].reshape(-1, self.samples_per_peak)
+            self._push(buckets.min(axis=1), buckets.max(axis=1))
+
+    def result(self) -> bytes:
+        if self.rest.size:
+            self._push(self.rest.min(keepdims=True), self.rest.max(keepdims=True))
+            self.rest = np.empty(0, dtype=np.float32)
+        empty = np.empty(0, dtype=np.int8)
+        return encode_peaks(
+            np.concatenate(self.mins) if self.mins else empty,
+            np.concatenate(self.maxs) if self.maxs else empty,
+            sample_rate=self.frame_rate,
+            samples_per_peak=self.samples_per_peak,
+            frames=self.frames,
+        )
+
+    def _push(self, lo: np.ndarray, hi: np.ndarray) -> None:
+        self.mins.append(_quantize(lo))
+        self.maxs.append(_quantize(hi))
+
+
+class PeaksAnalyzer:
+    """In-memory ``audio.Analyzer`` counterpart of ``StreamingPeaks``."""
+
+    name = "peaks"
+
+    def analyze(self, audio: AudioSegment) -> bytes:
+        return peaks_from_samples(to_mono_float(audio), audio.frame_rate)
+
+
+def peaks_key(audio_key: str) -> str:
+    """Storage key of the pyramid for ``audio_key`` (shared by identical content)."""
+    return str(PurePosixPath(audio_key).with_suffix(".peaks"))
+
+
+def needs_peaks(audio_key: str) -> bool:
+    return settings.PEAKS_ENABLED and not get_storage().exists(peaks_key(audio_key))
+
+
+def build_peaks(audio_path: Path) -> bytes:
+    """Separate streaming pass for recordings whose analysis did not produce peaks."""
+    frame_rate, chunks = iter_pcm(audio_path)
+    stream = StreamingPeaks()
+    stream.start(frame_rate)
+    for chunk in chunks:
+        stream.feed(chunk)
+    return stream.result()
+
+
+def read_info(f: BinaryIO) -> PeaksInfo:
+    f.seek(0)
+    head = f.read(_HEADER.size)
+    if len(head) < _HEADER.size:
+        raise PeaksError("corrupt_peaks")
+    magic, version, n_levels, rate, spp, frames = _HEADER.unpack(head)
+    if magic != MAGIC or version != VERSION:
+        raise PeaksError("unsupported_peaks_format")
+    table = f.read(_LEVEL.size * n_levels)
+    levels = tuple(_LEVEL.unpack_from(table, i * _LEVEL.size) for i in range(n_levels))
+    return PeaksInfo(sample_rate=rate, samples_per_peak=spp, frames=frames, levels=levels)
+
+
+def bucket_range(info: PeaksInfo, level: int, start_ms: int, end_ms: int | None) -> tuple[int, int]:
+    """Buckets of ``level`` covering ``[start_ms, end_ms)`` (``None``: to the end)."""
+    size = info.bucket_samples(level)
+    count = info.levels[level][1]
+    start = start_ms * info.sample_rate // 1000 // size
+    end = count if end_ms is None else -(-(end_ms * info.sample_rate // 1000) // size)
+    return min(start, count), min(end, count)
+
+
+def read_range(f: BinaryIO, info: PeaksInfo, level: int, start: int, end: int) -> bytes:
+    """Raw int8 (min, max) pairs of buckets ``[start, end)`` at ``level``."""
+    offset, count = info.levels[level]
+    start, end = max(0, min(start, count)), max(0, min(end, count))
+    if end <= start:
+        return b""
+    f.seek(offset + 2 * start)
+    return f.read(2 * (end - start))
+
+
+def _quantize(values: np.ndarray) -> np.ndarray:
+    return np.clip(np.round(values * 127.0), -127, 127).astype(np.int8)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from enum import StrEnum
+from sqlalchemy import func, or_
+from sqlalchemy.sql.elements import ColumnElement
+from ..models import Call
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+class SearchStrategy(StrEnum):
+    prefix = "prefix"  # "+7999": btree text_pattern_ops
+    suffix = "suffix"  # "*1234": btree on reverse(digits)
+    substring = "substring"  # anything else: pg_trgm GIN (a scan below 3 digits)
+    raw = "raw"  # no digits: ILIKE on the stored numbers, as before digit search
+
+
+@dataclass(frozen=True)
+class SearchPlan:
+    strategy: SearchStrategy
+    digits: str
+    text: str = ""
+
+    def condition(self) -> ColumnElement[bool]:
+        if self.strategy is SearchStrategy.raw:
+            return or_(Call.caller.ilike(f"%{self.text}%"), Call.receiver.ilike(f"%{self.text}%"))
+        cols = (Call.caller_digits, Call.receiver_digits)
+        if self.strategy is SearchStrategy.prefix:
+            return or_(*(c.like(f"{self.digits}%") for c in cols))
+        if self.strategy is SearchStrategy.suffix:
+            # Matches the expression index on reverse(<col>_digits)
+            return or_(*(func.reverse(c).like(f"{self.digits[::-1]}%") for c in cols))
+        return or_(*(c.like(f"%{self.digits}%") for c in cols))
+
+
+def plan_search(query: str) -> SearchPlan:
+    """Pick an index-friendly strategy for a phone-number query.
+
+    Numbers are matched on their digits only, so "+7 (999) 123" and "7999123"
+    are the same query. A leading "+" anchors at the start of the number, a
+    leading "*" at the end; otherwise the digits may appear anywhere, as the
+    old ``ILIKE '%query%'`` search did. Fewer than three digits have no
+    trigram to look up, so that substring search scans the rows in the
+    ``started_at`` window instead. Inputs without digits keep the old ILIKE
+    on the stored numbers.
+    """
+    q = query.strip()
+    digits = _NON_DIGITS.sub("", q)
+    if not digits:
+        return SearchPlan(SearchStrategy.raw, digits, text=q)
+    if q.startswith("*"):
+        return SearchPlan(SearchStrategy.suffix, digits)
+    if q.startswith("+"):
+        return SearchPlan(SearchStrategy.prefix, digits)
+    return SearchPlan(SearchStrategy.substring, digits)
@@ -0,0 +1,266 @@
+from __future__ import annotations
+import mmap
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+# Header-only metadata for WAV (RIFF/RF64) and MP3; nothing here decodes PCM.
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+_MPEG_VERSIONS = {0: 2.5, 2: 2, 3: 1}
+_MPEG_LAYERS = {1: 3, 2: 2, 3: 1}
+_SAMPLE_RATES = {
+    1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    2.5: (11025, 12000, 8000),
+}
+_BITRATES = {  # kbps, index 1..14
+    (1, 1): (32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Bytes searched for the first MPEG frame after any ID3v2 tag
+_SYNC_WINDOW = 64 * 1024
+
+
+class ProbeError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class AudioInfo:
+    format: str
+    duration: float  # seconds
+    sample_rate: int
+    channels: int
+    bitrate: int  # bits per second (average for VBR)
+
+
+@dataclass(frozen=True)
+class _MpegFrame:
+    version: float
+    layer: int
+    bitrate: int  # bps
+    sample_rate: int
+    channels: int
+    length: int  # bytes, including header
+    samples: int
+
+
+def probe(path: Path, *, decode_fallback: bool = True) -> AudioInfo:
+    """Read duration/sample rate/channels/bitrate from file headers.
+
+    WAV and MP3 are parsed without decoding. Other inputs (or headers that
+    cannot be parsed) fall back to a full pydub decode when
+    ``decode_fallback`` is set, otherwise raise ``ProbeError``.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(12)
+            f.seek(0)
+            if head[:4] in (b"RIFF", b"RF64") and head[8:12] == b"WAVE":
+                return probe_wav(f)
+            return probe_mp3(f)
+    except ProbeError:
+        if not decode_fallback:
+            raise
+    return _probe_by_decoding(path)
+
+
+def probe_wav(f: BinaryIO) -> AudioInfo:
+    file_size = _size(f)
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] not in (b"RIFF", b"RF64") or riff[8:12] != b"WAVE":
+        raise ProbeError("not_wav")
+    fmt: tuple[int, int, int, int, int, int] | None = None
+    ds64_data_size: int | None = None
+    data_size: int | None = None
+    while fmt is None or data_size is None:
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        chunk_id, size = header[:4], struct.unpack("<I", header[4:])[0]
+        start = f.tell()
+        if chunk_id == b"fmt ":
+            body = f.read(min(size, 40))
+            if len(body) < 16:
+                raise ProbeError("bad_fmt_chunk")
+            fmt = struct.unpack("<HHIIHH", body[:16])
+            if fmt[0] == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                sub = struct.unpack("<H", body[24:26])[0]
+                fmt = (sub,) + fmt[1:]
+        elif chunk_id == b"ds64":
+            body = f.read(16)
+            if len(body) == 16:
+                ds64_data_size = struct.unpack("<Q", body[8:16])[0]
+        elif chunk_id == b"data":
+            if size == 0xFFFFFFFF and ds64_data_size is not None:
+                size = ds64_data_size
+            # Streamed/truncated files often carry a bogus size: trust the file
+            data_size = min(size, file_size - start) if size else file_size - start
+        f.seek(start + size + (size & 1))
+    if fmt is None or data_size is None:
+        raise ProbeError("missing_wav_chunks")
+    audio_format, channels, rate, byte_rate, block_align, _bits = fmt
+    if audio_format not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT) or not rate or not block_align:
+        raise ProbeError("unsupported_wav_encoding")
+    frames = data_size // block_align
+    return AudioInfo(
+        format="wav",
+        duration=frames / rate,
+        sample_rate=rate,
+        channels=channels,
+        bitrate=byte_rate * 8,
+    )
+
+
+def probe_mp3(f: BinaryIO) -> AudioInfo:
+    file_size = _size(f)
+    if file_size == 0:
+        raise ProbeError("empty_file")
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        start = _skip_id3v2(buf)
+        has_id3v1 = file_size >= 128 and buf[file_size - 128:file_size - 125] == b"TAG"
+        end = file_size - 128 if has_id3v1 else file_size
+        offset, first = _find_first_frame(buf, start, end)
+
+        frames = _xing_frames(buf, offset, first) or _vbri_frames(buf, offset)
+        if frames is not None:
+            audio_bytes = end - offset - first.length
+            duration = frames * first.samples / first.sample_rate
+        else:
+            frames, audio_bytes = _scan_frames(buf, offset, end)
+            duration = frames * first.samples / first.sample_rate
+    if duration <= 0:
+        raise ProbeError("no_mpeg_frames")
+    return AudioInfo(
+        format="mp3",
+        duration=duration,
+        sample_rate=first.sample_rate,
+        channels=first.channels,
+        bitrate=int(audio_bytes * 8 / duration),
+    )
+
+
+def parse_mpeg_header(b: bytes) -> _MpegFrame | None:
+    if len(b) < 4 or b[0] != 0xFF or (b[1] & 0xE0) != 0xE0:
+        return None
+    version = _MPEG_VERSIONS.get((b[1] >> 3) & 3)
+    layer = _MPEG_LAYERS.get((b[1] >> 1) & 3)
+    bitrate_idx, sr_idx = b[2] >> 4, (b[2] >> 2) & 3
+    if version is None or layer is None or bitrate_idx in (0, 15) or sr_idx == 3:
+        return None
+    family = 1 if version == 1 else 2
+    bitrate = _BITRATES[(family, layer)][bitrate_idx - 1] * 1000
+    sample_rate = _SAMPLE_RATES[version][sr_idx]
+    padding = (b[2] >> 1) & 1
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+        samples = 384
+    elif layer == 3 and family == 2:
+        length = 72 * bitrate // sample_rate + padding
+        samples = 576
+    else:
+        length = 144 * bitrate // sample_rate + padding
+        samples = 1152
+    channels = 1 if (b[3] >> 6) == 3 else 2
+    return _MpegFrame(version, layer, bitrate, sample_rate, channels, length, samples)
+
+
+def _find_first_frame(buf: mmap.mmap, start: int, end: int) -> tuple[int, _MpegFrame]:
+    limit = min(end - 4, start + _SYNC_WINDOW)
+    pos = buf.find(b"\xff", start, limit)
+    while 0 <= pos < limit:
+        frame = parse_mpeg_header(buf[pos:pos + 4])
+        if frame is not None:
+            # Require a consistent follow-up header to reject false syncs
+            nxt = pos + frame.length
+            if nxt == end:
+                return pos, frame
+            follow = parse_mpeg_header(buf[nxt:nxt + 4])
+            if follow is not None and follow.sample_rate == frame.sample_rate:
+                return pos, frame
+        pos = buf.find(b"\xff", pos + 1, limit)
+    raise ProbeError("no_mpeg_sync")
+
+
+def _xing_frames(buf: mmap.mmap, offset: int, frame: _MpegFrame) -> int | None:
+    if frame.layer != 3:
+        return None
+    if frame.version == 1:
+        side_info = 17 if frame.channels == 1 else 32
+    else:
+        side_info = 9 if frame.channels == 1 else 17
+    tag = offset + 4 + side_info
+    if buf[tag:tag + 4] not in (b"Xing", b"Info"):
+        return None
+    flags = struct.unpack(">I", buf[tag + 4:tag + 8])[0]
+    if not flags & 0x1:
+        return None
+    return int(struct.unpack(">I", buf[tag + 8:tag + 12])[0])
+
+
+def _vbri_frames(buf: mmap.mmap, offset: int) -> int | None:
+    tag = offset + 4 + 32
+    if buf[tag:tag + 4] != b"VBRI":
+        return None
+    return int(struct.unpack(">I", buf[tag + 14:tag + 18])[0])
+
+
+def _scan_frames(buf: mmap.mmap, offset: int, end: int) -> tuple[int, int]:
+    """Walk frame headers (no decoding) and count frames and audio bytes."""
+    frames = 0
+    pos = offset
+    while pos + 4 <= end:
+        frame = parse_mpeg_header(buf[pos:pos + 4])
+        if frame is None or frame.length <= 0:
+            break
+        frames += 1
+        pos += frame.length
+    return frames, min(pos, end) - offset
+
+
+def _skip_id3v2(buf: mmap.mmap) -> int:
+    pos = 0
+    # Some files carry several stacked ID3v2 tags
+    while buf[pos:pos + 3] == b"ID3" and len(buf) >= pos + 10:
+        size_bytes = buf[pos + 6:pos + 10]
+        size = 0
+        for b in size_bytes:
+            size = (size << 7) | (b & 0x7F)
+        footer = 10 if buf[pos + 5] & 0x10 else 0
+        pos += 10 + size + footer
+    return pos
+
+
+def _size(f: BinaryIO) -> int:
+    pos = f.tell()
+    f.seek(0, 2)
+    size = f.tell()
+    f.seek(pos)
+    return size
+
+
+def _probe_by_decoding(path: Path) -> AudioInfo:
+    from pydub import AudioSegment
+
+    try:
+        audio = AudioSegment.from_file(path)
+    except Exception as exc:
+        raise ProbeError("undecodable_audio") from exc
+    duration = audio.duration_seconds
+    size = path.stat().st_size
+    return AudioInfo(
+        format=path.suffix.lower().lstrip(".") or "unknown",
+        duration=duration,
+        sample_rate=audio.frame_rate,
+        channels=audio.channels,
+        bitrate=int(size * 8 / duration) if duration else 0,
+    )
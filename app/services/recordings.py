@@ -1,29 +1,84 @@
 from __future__ import annotations
 import uuid
-from sqlalchemy import select
+from sqlalchemy import String, Uuid, bindparam, delete, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from ..core import tracing
 from ..models import Call, Recording, CallStatus
+from .cache import call_cache
+from .events import publish_status
+from .marks import SilenceMarks, encode_marks
+from .outbox import enqueue_from
 
 
 class RecordingAlreadyExists(Exception):
     pass
 
 
-async def create_recording(session: AsyncSession, *, call_id: uuid.UUID, filename: str) -> Recording:
-    existing = await session.execute(select(Recording).where(Recording.call_id == call_id))
-    if existing.scalar_one_or_none():
-        raise RecordingAlreadyExists
+class CallNotFound(Exception):
+    pass
+
+
+class RecordingNotFound(Exception):
+    pass
 
-    rec = Recording(call_id=call_id, filename=filename)
-    session.add(rec)
 
-    call = await session.get(Call, call_id)
-    if call:
-        call.status = CallStatus.processing
+async def create_recording(
+    session: AsyncSession,
+    *,
+    call_id: uuid.UUID,
+    filename: str,
+    content_hash: str | None = None,
+    dispatch: dict | None = None,
+) -> dict:
+    """Insert the recording and move the call to ``processing`` in one statement.
 
+    The row is selected from ``call`` (there is no foreign key on the
+    partitioned table), so an unknown call inserts nothing: ``CallNotFound``.
+    ``ON CONFLICT (call_id) DO NOTHING`` makes the unique index the arbiter:
+    of two concurrent uploads for a call exactly one gets a row back, the
+    other gets ``RecordingAlreadyExists``. The call is only updated when the
+    insert happened (the UPDATE reads the INSERT's RETURNING rows), and the
+    same goes for ``dispatch`` (an ``outbox_message``), queued in the outbox.
+    """
+    src = (
+        select(
+            literal(uuid.uuid4(), Uuid),
+            Call.id,
+            literal(filename, String),
+            literal(content_hash, String),
+            func.now(),
+            func.now(),
+        )
+        .where(Call.id == call_id)
+        .limit(1)
+    )
+    cols = ["id", "call_id", "filename", "content_hash", "created_at", "updated_at"]
+    ins = (
+        pg_insert(Recording)
+        .from_select(cols, src)
+        .on_conflict_do_nothing(index_elements=[Recording.call_id])
+        .returning(Recording.id, Recording.call_id, Recording.filename, Recording.content_hash)
+        .cte("ins")
+    )
+    set_status = (
+        update(Call)
+        .where(Call.id == ins.c.call_id)
+        .values(status=CallStatus.processing, updated_at=func.now())
+        .cte("set_status")
+    )
+    stmt = select(ins).add_cte(set_status)
+    if dispatch is not None:
+        stmt = stmt.add_cte(enqueue_from(ins, dispatch).cte("enqueue"))
+    res = await session.execute(stmt)
+    row = res.one_or_none()
+    if row is None:
+        await session.rollback()
+        found = await session.execute(select(Call.id).where(Call.id == call_id).limit(1))
+        raise RecordingAlreadyExists if found.first() is not None else CallNotFound
     await session.commit()
-    await session.refresh(rec)
-    return rec
+    await _status_changed(call_id, CallStatus.processing)
+    return dict(row._mapping)
 
 
 async def mark_ready(
@@ -32,24 +87,138 @@ async def mark_ready(
     call_id: uuid.UUID,
     duration: int,
     transcript: str,
-    silence: list | None,
+    silence: list | bytes | None,
 ) -> None:
-    res = await session.execute(select(Recording).where(Recording.call_id == call_id))
-    rec = res.scalar_one_or_none()
-    if not rec:
+    """Store the analysis and set the call ``ready`` in one statement.
+
+    The recording UPDATE runs in a CTE whose RETURNING rows drive the call
+    UPDATE, so a call without a recording is left untouched.
+    """
+    values = {"duration_sec": duration, "transcription": transcript, "updated_at": func.now()}
+    if silence is not None:
+        values["silence_marks"] = encode_marks(silence)
+    with tracing.span("recording.mark_ready", call_id=call_id):
+        rec = (
+            update(Recording)
+            .where(Recording.call_id == call_id)
+            .values(**values)
+            .returning(Recording.call_id)
+            .cte("rec")
+        )
+        res = await session.execute(
+            update(Call)
+            .where(Call.id == rec.c.call_id)
+            .values(status=CallStatus.ready, updated_at=func.now()),
+            execution_options={"synchronize_session": False},
+        )
+        await session.commit()
+        if res.rowcount:
+            await _status_changed(call_id, CallStatus.ready)
+
+
+async def reject_recording(session: AsyncSession, *, call_id: uuid.UUID) -> None:
+    """Drop a recording that is not audio and move the call back to ``created``.
+
+    As in ``mark_ready`` the DELETE's RETURNING rows drive the call UPDATE;
+    the call accepts a new upload afterwards.
+    """
+    rec = (
+        delete(Recording)
+        .where(Recording.call_id == call_id)
+        .returning(Recording.call_id)
+        .cte("rec")
+    )
+    res = await session.execute(
+        update(Call)
+        .where(Call.id == rec.c.call_id)
+        .values(status=CallStatus.created, updated_at=func.now()),
+        execution_options={"synchronize_session": False},
+    )
+    await session.commit()
+    if res.rowcount:
+        await _status_changed(call_id, CallStatus.created)
+
+
+async def mark_ready_many(session: AsyncSession, items: list[dict]) -> None:
+    """Apply several finished analyses in one transaction.
+
+    ``items`` hold call_id/duration/transcript/silence like ``mark_ready``;
+    silence may be a list of intervals or already packed bytes, and ``None``
+    leaves the stored marks untouched, as in ``mark_ready``.
+    """
+    if not items:
         return
-    rec.duration_sec = duration
-    rec.transcription = transcript
-    if hasattr(Recording, "silence_marks") and silence is not None:
-        setattr(rec, "silence_marks", silence)  # type: ignore[attr-defined]
+    with tracing.span("recording.mark_ready_many", calls=len(items)):
+        await _mark_ready_many(session, items)
 
-    call = await session.get(Call, call_id)
-    if call:
-        call.status = CallStatus.ready
 
+async def _mark_ready_many(session: AsyncSession, items: list[dict]) -> None:
+    rec_table = Recording.__table__
+    await session.execute(
+        update(rec_table)
+        .where(rec_table.c.call_id == bindparam("b_call_id"))
+        .values(
+            duration_sec=bindparam("b_duration"),
+            transcription=bindparam("b_transcript"),
+            silence_marks=func.coalesce(
+                bindparam("b_silence", type_=rec_table.c.silence_marks.type), rec_table.c.silence_marks
+            ),
+            updated_at=func.now(),
+        ),
+        [
+            {
+                "b_call_id": it["call_id"],
+                "b_duration": it["duration"],
+                "b_transcript": it["transcript"],
+                "b_silence": encode_marks(it["silence"]),
+            }
+            for it in items
+        ],
+    )
+    call_ids = [it["call_id"] for it in items]
+    with_recording = select(Recording.call_id).where(Recording.call_id.in_(call_ids))
+    res = await session.execute(
+        update(Call)
+        .where(Call.id.in_(with_recording))
+        .values(status=CallStatus.ready, updated_at=func.now())
+        .returning(Call.id),
+        execution_options={"synchronize_session": False},
+    )
+    updated = list(res.scalars())
     await session.commit()
+    # Only calls that have a recording were changed
+    for call_id in updated:
+        await _status_changed(call_id, CallStatus.ready)
 
 
 async def get_recording_by_call_id(session: AsyncSession, *, call_id: uuid.UUID) -> Recording | None:
     res = await session.execute(select(Recording).where(Recording.call_id == call_id))
     return res.scalar_one_or_none()
+
+
+async def get_recording_keys(session: AsyncSession, call_ids: list[uuid.UUID]) -> dict[uuid.UUID, str]:
+    """Storage keys (``Recording.filename``) of many calls in one query."""
+    if not call_ids:
+        return {}
+    res = await session.execute(
+        select(Recording.call_id, Recording.filename).where(Recording.call_id.in_(call_ids))
+    )
+    return {r.call_id: r.filename for r in res}
+
+
+async def get_silence_marks(session: AsyncSession, *, call_id: uuid.UUID) -> SilenceMarks | None:
+    """Packed silence marks of a call's recording; ``None`` until analysed.
+
+    Only the blob column is read; decoding is left to the caller.
+    """
+    res = await session.execute(select(Recording.silence_marks).where(Recording.call_id == call_id))
+    row = res.one_or_none()
+    if row is None:
+        raise RecordingNotFound
+    return None if row.silence_marks is None else SilenceMarks(row.silence_marks)
+
+
+async def _status_changed(call_id: uuid.UUID, status: CallStatus) -> None:
+    # After commit: drop cached reads, then notify subscribers (SSE)
+    await call_cache.invalidate(call_id)
+    await publish_status(call_id, status)
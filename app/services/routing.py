@@ -0,0 +1,30 @@
+from __future__ import annotations
+from enum import StrEnum
+from ..core.config import settings
+from .probe import AudioInfo
+
+
+class Priority(StrEnum):
+    urgent = "urgent"
+    normal = "normal"
+    low = "low"
+
+
+# Redis transport priorities: 0 is served first (see broker_transport_options)
+PRIORITY_LEVELS = {Priority.urgent: 0, Priority.normal: 3, Priority.low: 6}
+
+
+def choose_queue(info: AudioInfo | None, size_bytes: int) -> str:
+    """Send long recordings to their own queue so they never block short ones.
+
+    Uses the probed duration; falls back to file size when it is unknown.
+    """
+    if info is not None and info.duration > 0:
+        is_long = info.duration >= settings.QUEUE_LONG_MIN_SEC
+    else:
+        is_long = size_bytes >= settings.QUEUE_LONG_MIN_BYTES
+    return settings.QUEUE_LONG if is_long else settings.QUEUE_SHORT
+
+
+def task_options(info: AudioInfo | None, size_bytes: int, priority: Priority) -> dict:
+    return {"queue": choose_queue(info, size_bytes), "priority": PRIORITY_LEVELS[priority]}
@@ -0,0 +1,134 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List
+import numpy as np
+from pydub import AudioSegment
+from ..core.config import settings
+
+# Signed integer dtype per pydub sample width (8-bit WAV is unsigned and re-centred)
+_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+DEFAULT_THRESHOLD_DB = -40.0
+DEFAULT_MIN_SILENCE_MS = 500
+DEFAULT_PADDING_MS = 100
+DEFAULT_FRAME_MS = 20
+
+
+@dataclass(frozen=True)
+class SilenceParams:
+    threshold_db: float
+    min_silence_ms: int
+    padding_ms: int
+    frame_ms: int
+
+
+def silence_params(
+    *,
+    threshold_db: float | None = None,
+    min_silence_ms: int | None = None,
+    padding_ms: int | None = None,
+    frame_ms: int | None = None,
+) -> SilenceParams:
+    """Detection parameters: the ones given, ``SILENCE_*`` settings for the rest."""
+    return SilenceParams(
+        threshold_db=settings.SILENCE_THRESHOLD_DB if threshold_db is None else threshold_db,
+        min_silence_ms=settings.SILENCE_MIN_MS if min_silence_ms is None else min_silence_ms,
+        padding_ms=settings.SILENCE_PADDING_MS if padding_ms is None else padding_ms,
+        frame_ms=settings.SILENCE_FRAME_MS if frame_ms is None else frame_ms,
+    )
+
+
+def to_mono_float(audio: AudioSegment) -> np.ndarray:
+    """Return samples of ``audio`` as a mono float32 array in [-1.0, 1.0]."""
+    return pcm_to_mono(audio.raw_data, audio.sample_width, audio.channels)
+
+
+def pcm_to_mono(raw_data: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """Convert interleaved integer PCM bytes to a mono float32 array in [-1.0, 1.0]."""
+    dtype = _DTYPES.get(sample_width)
+    if dtype is None:
+        raise ValueError(f"unsupported_sample_width: {sample_width}")
+    raw = np.frombuffer(raw_data, dtype=dtype)
+    raw = raw[: len(raw) - len(raw) % channels]
+    # Strided per-channel sums avoid a (n, channels) float temporary
+    samples = raw[0::channels].astype(np.float32)
+    for ch in range(1, channels):
+        samples += raw[ch::channels]
+    if sample_width == 1:
+        samples -= 128.0 * channels
+    samples *= 1.0 / (channels * float(2 ** (8 * sample_width - 1)))
+    return samples
+
+
+def frame_length(frame_rate: int, frame_ms: int = DEFAULT_FRAME_MS) -> int:
+    return max(1, frame_rate * frame_ms // 1000)
+
+
+def frame_rms_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    """RMS level in dBFS of consecutive ``frame_len`` windows (last one may be partial)."""
+    n = len(samples)
+    full, rest = divmod(n, frame_len)
+    frames = samples[: full * frame_len].reshape(full, frame_len)
+    energy = np.einsum("ij,ij->i", frames, frames)
+    rms = np.sqrt(energy / frame_len)
+    if rest:
+        tail = samples[full * frame_len:]
+        rms = np.append(rms, np.sqrt(np.dot(tail, tail) / rest))
+    return (20.0 * np.log10(np.maximum(rms, 1e-10))).astype(np.float32)
+
+
+def silent_runs(silent: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Start (inclusive) and end (exclusive) indices of ``True`` runs in ``silent``."""
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_silence(
+    samples: np.ndarray,
+    frame_rate: int,
+    *,
+    threshold_db: float = DEFAULT_THRESHOLD_DB,
+    min_silence_ms: int = DEFAULT_MIN_SILENCE_MS,
+    padding_ms: int = DEFAULT_PADDING_MS,
+    frame_ms: int = DEFAULT_FRAME_MS,
+) -> List[Dict[str, int]]:
+    """Detect silent intervals in mono float ``samples``.
+
+    A frame is silent when its RMS level is below ``threshold_db``. Runs of
+    silent frames shorter than ``min_silence_ms`` are ignored; the remaining
+    runs are shrunk by ``padding_ms`` on each side so speech edges are not
+    clipped. Returns ``[{"start": ms, "end": ms}, ...]``.
+    """
+    if frame_rate <= 0 or len(samples) == 0:
+        return []
+    frame_len = frame_length(frame_rate, frame_ms)
+    levels = frame_rms_db(samples, frame_len)
+    starts, ends = silent_runs(levels < threshold_db)
+    return intervals_ms(
+        starts * frame_len,
+        np.minimum(ends * frame_len, len(samples)),
+        frame_rate,
+        min_silence_ms=min_silence_ms,
+        padding_ms=padding_ms,
+    )
+
+
+def intervals_ms(
+    start_samples: np.ndarray,
+    end_samples: np.ndarray,
+    frame_rate: int,
+    *,
+    min_silence_ms: int,
+    padding_ms: int,
+) -> List[Dict[str, int]]:
+    """Convert silent runs given in samples to padded millisecond intervals."""
+    start_ms = start_samples.astype(np.int64) * 1000 // frame_rate
+    end_ms = end_samples.astype(np.int64) * 1000 // frame_rate
+    keep = end_ms - start_ms >= min_silence_ms
+    start_ms = start_ms[keep] + padding_ms
+    end_ms = end_ms[keep] - padding_ms
+    valid = end_ms > start_ms
+    return [
+        {"start": int(s), "end": int(e)}
+        for s, e in zip(start_ms[valid].tolist(), end_ms[valid].tolist())
+    ]
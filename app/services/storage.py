@@ -1,75 +1,646 @@
 from __future__ import annotations
+import asyncio
+import contextlib
+import hashlib
+import io
+import os
+import stat
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import BinaryIO
+from typing import BinaryIO, ContextManager, Iterator, Protocol
 from ..core.config import settings
+from .cache import LRUCache
 try:
     import boto3  # type: ignore
+    from boto3.s3.transfer import TransferConfig  # type: ignore
     from botocore.client import Config  # type: ignore
+    from botocore.exceptions import ClientError  # type: ignore
 except Exception:  # optional dependency
     boto3 = None
     Config = None
+    TransferConfig = None
+
+    class ClientError(Exception):  # type: ignore[no-redef]
+        pass
 
 ALLOWED_EXT = {".mp3", ".wav"}
+CHUNK_SIZE = 1024 * 1024
+CONTENT_PREFIX = "objects/"
+# Dot files in the S3 blob cache older than this were left by a crashed process
+_STALE_TEMP_SEC = 24 * 3600
 
 
 class StorageError(Exception):
     pass
 
 
+class UploadTooLarge(StorageError):
+    pass
+
+
 class PresignNotConfigured(Exception):
     pass
 
 
+class AsyncReadable(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    path: Path  # local file (for S3: the spooled upload, until commit/discard)
+    size: int
+    sha256: str
+    created: bool = True  # False when identical content was already stored
+    object_name: str | None = None  # set when ``path`` is not the final location
+
+    @property
+    def key(self) -> str:
+        """Path relative to ``RECORDINGS_DIR`` (also used as the object name)."""
+        return self.object_name or object_key(self.path)
+
+
+class AtomicWriter:
+    """Write to a temp file in ``directory``; hash and size-check while writing.
+
+    ``commit`` renames the temp file into place atomically, so readers never
+    see a partially written recording; ``abort`` removes it.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int | None = None) -> None:
+        ensure_dir(directory)
+        self.max_bytes = max_bytes
+        self.tmp = directory / f".{uuid.uuid4().hex}.part"
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._f = open(self.tmp, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise UploadTooLarge("file_too_large")
+        self._hash.update(chunk)
+        self._f.write(chunk)
+
+    def commit(self, dst: Path | None = None, *, ext: str = "") -> StoredFile:
+        """Move the data to ``dst``, or into the content store when omitted."""
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._f.close()
+        digest = self._hash.hexdigest()
+        if dst is None:
+            dst = content_path(digest, ext)
+            ensure_dir(dst.parent)
+            if dst.exists():
+                # Same bytes already stored: keep the existing object
+                self.tmp.unlink(missing_ok=True)
+                return StoredFile(path=dst, size=self.size, sha256=digest, created=False)
+        os.replace(self.tmp, dst)
+        return StoredFile(path=dst, size=self.size, sha256=digest)
+
+    def abort(self) -> None:
+        self._f.close()
+        self.tmp.unlink(missing_ok=True)
+
+
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def build_filename(call_id: uuid.UUID, original_name: str) -> str:
+def recordings_dir() -> Path:
+    return Path(str(settings.RECORDINGS_DIR))
+
+
+def allowed_extension(original_name: str) -> str:
     ext = Path(original_name).suffix.lower()
     if ext not in ALLOWED_EXT:
         raise StorageError("unsupported_extension")
-    return f"{call_id}{ext}"
+    return ext
+
+
+def build_filename(call_id: uuid.UUID, original_name: str) -> str:
+    return f"{call_id}{allowed_extension(original_name)}"
+
+
+def content_key(sha256: str, ext: str) -> str:
+    """Content-addressed key: ``objects/<2 hex>/<sha256><ext>``."""
+    return f"{CONTENT_PREFIX}{sha256[:2]}/{sha256}{ext}"
+
+
+def is_content_key(key: str) -> bool:
+    """Content-store keys may be reused by any later upload of the same bytes."""
+    return key.startswith(CONTENT_PREFIX)
+
+
+def content_path(sha256: str, ext: str) -> Path:
+    return recordings_dir() / content_key(sha256, ext)
+
+
+def object_key(path: Path) -> str:
+    return path.relative_to(recordings_dir()).as_posix()
+
+
+def resolve_key(key: str) -> Path:
+    # Tasks queued before keys were introduced carry absolute paths: kept as is
+    return recordings_dir() / key
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    ensure_dir(path.parent)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.part")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
 
 
 def save_file(call_id: uuid.UUID, original_name: str, fileobj: BinaryIO) -> Path:
-    base = Path(str(settings.RECORDINGS_DIR))
-    ensure_dir(base)
-    final_name = build_filename(call_id, original_name)
-    dst = base / final_name
-    with open(dst, "wb") as f:
+    base = recordings_dir()
+    dst = base / build_filename(call_id, original_name)
+    writer = AtomicWriter(base, settings.MAX_UPLOAD_BYTES)
+    try:
+        while True:
+            chunk = fileobj.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.commit(dst).path
+
+
+async def store_upload_async(original_name: str, fileobj: AsyncReadable) -> StoredFile:
+    """Stream an upload into the content-addressed store without blocking the loop.
+
+    Disk writes and hashing run in the default thread pool; the upload is
+    aborted as soon as it exceeds ``MAX_UPLOAD_BYTES``. Identical content is
+    stored once.
+    """
+    ext = allowed_extension(original_name)
+    return await _write_upload(fileobj, recordings_dir() / "tmp", lambda w: w.commit(ext=ext))
+
+
+async def _write_upload(fileobj: AsyncReadable, directory: Path, commit) -> StoredFile:
+    writer = await asyncio.to_thread(AtomicWriter, directory, settings.MAX_UPLOAD_BYTES)
+    try:
         while True:
-            chunk = fileobj.read(1024 * 1024)
+            chunk = await fileobj.read(CHUNK_SIZE)
             if not chunk:
                 break
-            f.write(chunk)
-    return dst
+            await asyncio.to_thread(writer.write, chunk)
+        return await asyncio.to_thread(commit, writer)
+    except BaseException:
+        await asyncio.to_thread(writer.abort)
+        raise
+
+
+_s3_lock = threading.Lock()
+_s3: tuple[tuple, object] | None = None  # (settings it was built from, client)
+_presign_lock = threading.Lock()
+_presigned = LRUCache(settings.PRESIGN_CACHE_SIZE, 0)
 
 
 def _s3_client():
-    if not getattr(settings, "S3_ENABLED", False):
+    """Process-wide S3 client (boto3 clients are thread-safe and pool connections).
+
+    Building a session and client costs tens of milliseconds, so it is done
+    once and rebuilt only if the S3 settings change.
+    """
+    global _s3
+    # The S3 storage backend needs the client whether or not S3_ENABLED is set
+    if not (settings.S3_ENABLED or settings.STORAGE_BACKEND == "s3"):
         raise PresignNotConfigured
     if boto3 is None or Config is None:
         raise PresignNotConfigured
-    session = boto3.session.Session()
-    return session.client(
-        "s3",
-        endpoint_url=getattr(settings, "S3_ENDPOINT_URL", None),
-        aws_access_key_id=getattr(settings, "S3_ACCESS_KEY", None),
-        aws_secret_access_key=getattr(settings, "S3_SECRET_KEY", None),
-        region_name=getattr(settings, "S3_REGION", None) or "us-east-1",
-        config=Config(signature_version="s3v4", s3={"addressing_style": "path"}, retries={"max_attempts": 2}),
-        use_ssl=bool(getattr(settings, "S3_SECURE", False)),
+    key = (
+        settings.S3_ENDPOINT_URL,
+        settings.S3_ACCESS_KEY,
+        settings.S3_SECRET_KEY,
+        settings.S3_REGION,
+        settings.S3_SECURE,
+        settings.S3_MAX_POOL_CONNECTIONS,
     )
+    cached = _s3
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with _s3_lock:
+        if _s3 is None or _s3[0] != key:
+            session = boto3.session.Session()
+            client = session.client(
+                "s3",
+                endpoint_url=getattr(settings, "S3_ENDPOINT_URL", None),
+                aws_access_key_id=getattr(settings, "S3_ACCESS_KEY", None),
+                aws_secret_access_key=getattr(settings, "S3_SECRET_KEY", None),
+                region_name=getattr(settings, "S3_REGION", None) or "us-east-1",
+                config=Config(
+                    signature_version="s3v4",
+                    s3={"addressing_style": "path"},
+                    retries={"max_attempts": 2},
+                    max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                ),
+                use_ssl=bool(getattr(settings, "S3_SECURE", False)),
+            )
+            _s3 = (key, client)
+        return _s3[1]
+
+
+def make_presigned_url(object_name: str, expires_in: int | None = None) -> str:
+    """Presigned GET URL, reused from cache while it stays valid long enough.
 
+    A cached URL is handed out until less than ``PRESIGN_CACHE_MIN_TTL_SEC``
+    of its lifetime is left, so callers always get at least that much.
+    """
+    return presigned_url(object_name, expires_in)[0]
 
-def make_presigned_url(object_name: str, expires_in: int = 3600) -> str:
+
+def presigned_url(object_name: str, expires_in: int | None = None) -> tuple[str, int]:
+    """``make_presigned_url`` plus the seconds the URL is still valid for."""
+    expires_in = expires_in or settings.PRESIGN_EXPIRES_SEC
     s3 = _s3_client()
     bucket = getattr(settings, "S3_BUCKET", None)
     if not bucket:
         raise PresignNotConfigured
-    return s3.generate_presigned_url(
+    key = (bucket, object_name, expires_in)
+    with _presign_lock:
+        cached = _presigned.get(key)
+    if cached is not None:
+        url, expires_at = cached
+        return url, max(0, int(expires_at - time.time()))
+    # Taken before signing: the reported lifetime never exceeds the real one
+    expires_at = time.time() + expires_in
+    url = s3.generate_presigned_url(
         ClientMethod="get_object",
         Params={"Bucket": bucket, "Key": object_name},
         ExpiresIn=expires_in,
     )
+    reuse_for = expires_in - settings.PRESIGN_CACHE_MIN_TTL_SEC
+    if reuse_for > 0:
+        with _presign_lock:
+            _presigned.set(key, (url, expires_at), ttl=reuse_for)
+    return url, expires_in
+
+
+class StorageBackend(Protocol):
+    """Where recordings and derived files (e.g. peaks) live, addressed by key.
+
+    Uploads are two-phase: ``stage_upload`` streams the body somewhere local
+    so it can be probed, then ``commit`` publishes it under ``StoredFile.key``
+    or ``discard`` drops it. Workers get a local file for decoding through
+    ``local_path``. ``open_write`` streams an object of unknown size; it only
+    appears under ``key`` if the block exits without an error.
+    """
+
+    name: str
+
+    async def stage_upload(self, original_name: str, fileobj: AsyncReadable) -> StoredFile: ...
+
+    async def commit(self, stored: StoredFile) -> None: ...
+
+    async def discard(self, stored: StoredFile) -> None: ...
+
+    def local_path(self, key: str) -> ContextManager[Path]: ...
+
+    def open(self, key: str) -> BinaryIO: ...
+
+    def exists(self, key: str) -> bool: ...
+
+    def size(self, key: str) -> int: ...
+
+    def write_bytes(self, key: str, data: bytes) -> None: ...
+
+    def open_write(self, key: str) -> ContextManager[BinaryIO]: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class LocalStorage:
+    """Files under ``RECORDINGS_DIR`` (a volume shared by API and workers)."""
+
+    name = "local"
+
+    async def stage_upload(self, original_name: str, fileobj: AsyncReadable) -> StoredFile:
+        # Written straight into the content store; nothing left to publish
+        return await store_upload_async(original_name, fileobj)
+
+    async def commit(self, stored: StoredFile) -> None:
+        return None
+
+    async def discard(self, stored: StoredFile) -> None:
+        if stored.created:
+            await asyncio.to_thread(stored.path.unlink, missing_ok=True)
+
+    @contextlib.contextmanager
+    def local_path(self, key: str) -> Iterator[Path]:
+        yield resolve_key(key)
+
+    def open(self, key: str) -> BinaryIO:
+        return open(resolve_key(key), "rb")
+
+    def exists(self, key: str) -> bool:
+        return resolve_key(key).exists()
+
+    def size(self, key: str) -> int:
+        return resolve_key(key).stat().st_size
+
+    def write_bytes(self, key: str, data: bytes) -> None:
+        write_atomic(resolve_key(key), data)
+
+    @contextlib.contextmanager
+    def open_write(self, key: str) -> Iterator[BinaryIO]:
+        dst = resolve_key(key)
+        ensure_dir(dst.parent)
+        tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex}.part")
+        try:
+            with open(tmp, "wb") as f:
+                yield f
+            os.replace(tmp, dst)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def delete(self, key: str) -> None:
+        resolve_key(key).unlink(missing_ok=True)
+
+
+class S3Storage:
+    """Objects in ``S3_BUCKET`` (S3 or MinIO); API and workers share no volume.
+
+    Uploads are spooled to local disk while hashing (the content key needs the
+    sha256), probed, then sent with a concurrent multipart upload. Workers
+    fetch objects with parallel ranged GETs into a local cache; objects are
+    content-addressed and never change, so cached copies stay valid. Pass
+    ``client``/``bucket`` to use another endpoint, e.g. a moto mock in tests.
+    """
+
+    name = "s3"
+
+    def __init__(self, client=None, bucket: str | None = None) -> None:
+        self._client = client
+        self.bucket = bucket or settings.S3_BUCKET
+        if not self.bucket:
+            raise PresignNotConfigured
+
+    @property
+    def client(self):
+        return self._client if self._client is not None else _s3_client()
+
+    @property
+    def cache_dir(self) -> Path:
+        return Path(settings.S3_CACHE_DIR)
+
+    async def stage_upload(self, original_name: str, fileobj: AsyncReadable) -> StoredFile:
+        ext = allowed_extension(original_name)
+        spool = self.cache_dir / "spool"
+
+        def commit(writer: AtomicWriter) -> StoredFile:
+            staged = writer.commit(spool / f"{uuid.uuid4().hex}{ext}")
+            key = content_key(staged.sha256, ext)
+            return StoredFile(
+                path=staged.path,
+                size=staged.size,
+                sha256=staged.sha256,
+                created=not self.exists(key),
+                object_name=key,
+            )
+
+        return await _write_upload(fileobj, spool, commit)
+
+    async def commit(self, stored: StoredFile) -> None:
+        try:
+            if stored.created:
+                await asyncio.to_thread(self._upload_file, stored.path, stored.key)
+        finally:
+            await asyncio.to_thread(stored.path.unlink, missing_ok=True)
+
+    async def discard(self, stored: StoredFile) -> None:
+        await asyncio.to_thread(stored.path.unlink, missing_ok=True)
+
+    @contextlib.contextmanager
+    def local_path(self, key: str) -> Iterator[Path]:
+        # The cache is shared by every worker process on the host, any of
+        # which may evict the blob: the caller gets a private hard link
+        # (dot-named, skipped by eviction) that stays valid until it returns
+        path = self.cache_dir / "blobs" / key
+        lease = path.with_name(f".{path.name}.{uuid.uuid4().hex}{path.suffix}")
+        try:
+            os.link(path, lease)
+            os.utime(lease)  # LRU order for eviction (same inode as the blob)
+        except FileNotFoundError:
+            size = self.size(key)
+            self._evict(reserve=size, keep=path)
+            self._download(key, path, size, lease)
+        try:
+            yield lease
+        finally:
+            lease.unlink(missing_ok=True)
+
+    def open(self, key: str) -> BinaryIO:
+        return io.BufferedReader(RangedReader(self.client, self.bucket, key), settings.S3_READ_BUFFER)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.size(key)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def size(self, key: str) -> int:
+        try:
+            return int(self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"])
+        except ClientError as exc:
+            if _is_not_found(exc):
+                raise FileNotFoundError(key) from exc
+            raise
+
+    def write_bytes(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data)
+
+    @contextlib.contextmanager
+    def open_write(self, key: str) -> Iterator[BinaryIO]:
+        """Multipart upload fed part by part: one ``S3_PART_SIZE`` buffer in memory."""
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=key)["UploadId"]
+        writer = MultipartWriter(self.client, self.bucket, key, upload_id)
+        try:
+            yield writer
+            writer.complete()
+        except BaseException:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        (self.cache_dir / "blobs" / key).unlink(missing_ok=True)
+
+    def presign_put(self, key: str, expires_in: int | None = None) -> str:
+        """URL for a client-side ``PUT`` of ``key`` (direct upload, no API hop)."""
+        return self.client.generate_presigned_url(
+            ClientMethod="put_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires_in or settings.S3_UPLOAD_URL_EXPIRES_SEC,
+        )
+
+    def _upload_file(self, path: Path, key: str) -> None:
+        config = TransferConfig(
+            multipart_threshold=settings.S3_PART_SIZE,
+            multipart_chunksize=settings.S3_PART_SIZE,
+            max_concurrency=settings.S3_TRANSFER_CONCURRENCY,
+        )
+        self.client.upload_file(str(path), self.bucket, key, Config=config)
+
+    def _download(self, key: str, dst: Path, size: int, lease: Path) -> None:
+        ensure_dir(dst.parent)
+        tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex}.part")
+        part = settings.S3_PART_SIZE
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+
+            def fetch(start: int) -> None:
+                end = min(start + part, size) - 1
+                res = self.client.get_object(Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}")
+                body = res["Body"]
+                pos = start
+                for chunk in body.iter_chunks(CHUNK_SIZE):
+                    os.pwrite(fd, chunk, pos)
+                    pos += len(chunk)
+
+            with ThreadPoolExecutor(settings.S3_TRANSFER_CONCURRENCY) as pool:
+                list(pool.map(fetch, range(0, size, part)))
+            os.fsync(fd)
+        except BaseException:
+            os.close(fd)
+            tmp.unlink(missing_ok=True)
+            raise
+        os.close(fd)
+        os.link(tmp, lease)
+        os.replace(tmp, dst)
+
+    def _evict(self, reserve: int = 0, keep: Path | None = None) -> None:
+        """Make room for ``reserve`` bytes, oldest blobs first.
+
+        Other processes delete files while we scan: those are skipped. Dot
+        files (downloads in flight, leases held by ``local_path``) are left
+        alone unless a crashed process abandoned them long ago.
+        """
+        stats = []
+        stale = time.time() - _STALE_TEMP_SEC
+        for p in (self.cache_dir / "blobs").rglob("*"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            if not stat.S_ISREG(st.st_mode) or p == keep:
+                continue
+            if p.name.startswith("."):
+                if st.st_mtime < stale:
+                    p.unlink(missing_ok=True)
+                continue
+            stats.append((st, p))
+        stats.sort(key=lambda sp: sp[0].st_mtime)
+        total = sum(st.st_size for st, _ in stats) + reserve
+        for st, p in stats:
+            if total <= settings.S3_CACHE_MAX_BYTES:
+                break
+            p.unlink(missing_ok=True)
+            total -= st.st_size
+
+
+class MultipartWriter(io.RawIOBase):
+    """Write-only stream sent as the parts of a multipart upload."""
+
+    def __init__(self, client, bucket: str, key: str, upload_id: str) -> None:
+        self.client, self.bucket, self.key, self.upload_id = client, bucket, key, upload_id
+        self.parts: list[dict] = []
+        self._buf = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._buf += b
+        while len(self._buf) >= settings.S3_PART_SIZE:
+            self._send(bytes(self._buf[: settings.S3_PART_SIZE]))
+            del self._buf[: settings.S3_PART_SIZE]
+        return len(b)
+
+    def complete(self) -> None:
+        # The last part may be short (or empty when nothing was written)
+        if self._buf or not self.parts:
+            self._send(bytes(self._buf))
+            self._buf.clear()
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+
+    def _send(self, data: bytes) -> None:
+        number = len(self.parts) + 1
+        res = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, PartNumber=number, Body=data
+        )
+        self.parts.append({"ETag": res["ETag"], "PartNumber": number})
+
+
+class RangedReader(io.RawIOBase):
+    """Seekable read-only view of an object; each read is one ranged GET."""
+
+    def __init__(self, client, bucket: str, key: str) -> None:
+        self.client, self.bucket, self.key = client, bucket, key
+        self.pos = 0
+        self._size: int | None = None
+
+    @property
+    def size(self) -> int:
+        if self._size is None:
+            try:
+                head = self.client.head_object(Bucket=self.bucket, Key=self.key)
+            except ClientError as exc:
+                if _is_not_found(exc):
+                    raise FileNotFoundError(self.key) from exc
+                raise
+            self._size = int(head["ContentLength"])
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.pos, io.SEEK_END: self.size}[whence]
+        self.pos = max(0, base + offset)
+        return self.pos
+
+    def readinto(self, b) -> int:
+        n = min(len(b), self.size - self.pos)
+        if n <= 0:
+            return 0
+        rng = f"bytes={self.pos}-{self.pos + n - 1}"
+        data = self.client.get_object(Bucket=self.bucket, Key=self.key, Range=rng)["Body"].read()
+        b[: len(data)] = data
+        self.pos += len(data)
+        return len(data)
+
+
+_storage: StorageBackend | None = None
+
+
+def get_storage() -> StorageBackend:
+    """Process-wide backend selected by ``STORAGE_BACKEND`` (local | s3)."""
+    global _storage
+    if _storage is None or _storage.name != settings.STORAGE_BACKEND:
+        _storage = S3Storage() if settings.STORAGE_BACKEND == "s3" else LocalStorage()
+    return _storage
+
+
+def _is_not_found(exc: Exception) -> bool:
+    code = str(getattr(exc, "response", {}).get("Error", {}).get("Code", ""))
+    return code in ("404", "NoSuchKey", "NotFound")
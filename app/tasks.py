@@ -1,31 +1,304 @@
 from __future__ import annotations
+import json
+import logging
 import uuid
+from datetime import datetime, timezone
 from pathlib import Path
-from celery import shared_task
-from .services.audio import duration_seconds, fake_transcript_first_20s, fake_silence_marks
-from .services.recordings import mark_ready
+from celery import chord, shared_task
+from .core import tracing, worker
+from .core.config import settings
+from .core.metrics import OUTBOX_LAG, stage_timer
+from .core.redis import get_redis
+from .services.audio import DEFAULT_ANALYZERS, analyze_file, analysis_version
+from .services.audio_stream import analyze_stream, default_streaming_analyzers, should_stream
+from .services.analysis_cache import get_cached_analysis, store_analysis
+from .services import outbox, parallel, partitions, peaks
+from .services.marks import encode_marks
+from .services.probe import ProbeError, probe
+from .services.recordings import mark_ready, mark_ready_many, reject_recording
+from .services.storage import get_storage
+
+# Redis list of finished analyses waiting for a batched commit; items that
+# failed READY_BATCH_MAX_ATTEMPTS flushes are moved to the dead-letter list
+READY_QUEUE_KEY = "recordings:ready"
+READY_DEAD_KEY = "recordings:ready:dead"
+
+log = logging.getLogger(__name__)
 
 
 @shared_task(name="tasks.process_recording")
-def process_recording(call_id: str, path_str: str) -> None:
-    path = Path(path_str)
-    dur = duration_seconds(path)
-    transcript = fake_transcript_first_20s(path)
-    silence = fake_silence_marks(path)
-
-    import asyncio
-
-    async def _save():
-        # Import SessionLocal inside the task to ensure engine/session
-        # are created in the worker process (after fork), not in parent.
-        from .core.db import SessionLocal
+def process_recording(call_id: str, key: str, content_hash: str | None = None) -> None:
+    """``key`` is the recording's storage key (``Recording.filename``)."""
+    with tracing.span("recording.process", call_id=call_id, key=key):
+        worker.run(_process(uuid.UUID(call_id), key, content_hash))
+
+
+@shared_task(name="tasks.analyze_segment")
+def analyze_segment(key: str, start: int, end: int | None) -> dict:
+    with get_storage().local_path(key) as path:
+        return parallel.analyze_segment(path, start, end)
+
+
+@shared_task(name="tasks.merge_segments")
+def merge_segments(parts: list[dict], call_id: str, content_hash: str | None, version: str) -> None:
+    """Chord callback: merge segment results and save them like a serial run."""
+    with tracing.span("recording.merge_segments", call_id=call_id, segments=len(parts)):
+        result = parallel.merge_segments(parts)
+        worker.run(_finish(uuid.UUID(call_id), content_hash, version, result))
+
+
+@shared_task(name="tasks.build_peaks")
+def build_peaks(key: str) -> None:
+    if peaks.needs_peaks(key):
+        with get_storage().local_path(key) as path, stage_timer("peaks"):
+            data = peaks.build_peaks(path)
+        get_storage().write_bytes(peaks.peaks_key(key), data)
+
+
+@shared_task(name="tasks.flush_ready_results")
+def flush_ready_results() -> int:
+    """Commit queued results (beat schedule when READY_BATCH_ENABLED)."""
+    return worker.run(_flush_ready())
+
+
+@shared_task(name="tasks.relay_outbox")
+def relay_outbox() -> int:
+    """Publish pending outbox rows (beat schedule, every OUTBOX_RELAY_SEC)."""
+    return worker.run(_relay_outbox())
+
+
+@shared_task(name="tasks.sweep_outbox")
+def sweep_outbox() -> dict:
+    """Re-send stuck tasks, delete rows of finished calls (every OUTBOX_SWEEP_SEC)."""
+    return worker.run(_sweep_outbox())
+
+
+@shared_task(name="tasks.maintain_call_partitions")
+def maintain_call_partitions() -> dict:
+    """Create upcoming monthly call partitions; archive expired ones (beat schedule)."""
+    return worker.run(_maintain_partitions())
+
+
+async def _process(call_id: uuid.UUID, key: str, content_hash: str | None) -> None:
+    # Import SessionLocal lazily so the engine is only touched in the worker process
+    from .core.db import SessionLocal
+
+    storage = get_storage()
+    version = analysis_version()
+    with_peaks = peaks.needs_peaks(key)
+    result = None
+    if content_hash is None and not _is_audio(storage, key):
+        # Direct uploads reach storage unchecked (the API never reads the body)
+        log.warning("recording %s of call %s is not audio, rejected", key, call_id)
+        async with SessionLocal() as session:
+            await reject_recording(session, call_id=call_id)
+        storage.delete(key)
+        return
+    if content_hash:
+        # A duplicate may have been analysed while this task was queued
         async with SessionLocal() as session:
+            result = await get_cached_analysis(session, content_hash=content_hash, version=version)
+    if result is None:
+        with storage.local_path(key) as path:
+            segments = parallel.plan_segments(path)
+            if segments is not None:
+                if with_peaks:
+                    build_peaks.apply_async(args=[key], queue=settings.QUEUE_SHORT)
+                _dispatch_segments(call_id, key, content_hash, version, segments)
+                return
+            result = _analyze(path, with_peaks)
+        if "peaks" in result:
+            storage.write_bytes(peaks.peaks_key(key), result.pop("peaks"))
+    elif with_peaks:
+        build_peaks(key)
+    await _finish(call_id, content_hash, version, result)
+
+
+def _is_audio(storage, key: str) -> bool:
+    # Same header-only check the API runs on regular uploads
+    with storage.local_path(key) as path:
+        try:
+            probe(path, decode_fallback=False)
+        except ProbeError:
+            return False
+    return True
+
+
+def _analyze(path: Path, with_peaks: bool) -> dict:
+    # One decode for all metrics (waveform peaks included): analyzers share the
+    # same PCM buffer, or for long recordings consume it chunk by chunk
+    if should_stream(path):
+        analyzers = default_streaming_analyzers()
+        if with_peaks:
+            analyzers.append(peaks.StreamingPeaks())
+        return analyze_stream(path, analyzers)
+    return analyze_file(path, DEFAULT_ANALYZERS + ((peaks.PeaksAnalyzer(),) if with_peaks else ()))
+
+
+def _dispatch_segments(
+    call_id: uuid.UUID,
+    key: str,
+    content_hash: str | None,
+    version: str,
+    segments: list[tuple[int, int | None]],
+) -> None:
+    # Segments are short tasks: run them on the short queue so every short
+    # worker process can take one, whatever queue the recording came from
+    header = [
+        analyze_segment.s(key, start, end).set(queue=settings.QUEUE_SHORT)
+        for start, end in segments
+    ]
+    callback = merge_segments.s(str(call_id), content_hash, version).set(queue=settings.QUEUE_SHORT)
+    chord(header)(callback)
+
+
+async def _finish(call_id: uuid.UUID, content_hash: str | None, version: str, result: dict) -> None:
+    item = {
+        "call_id": call_id,
+        "content_hash": content_hash,
+        "version": version,
+        "duration": result["duration"],
+        "transcript": result["transcript"],
+        "silence": result["silence"],
+    }
+    if settings.READY_BATCH_ENABLED:
+        await _enqueue_ready(item)
+    else:
+        await _save([item])
+
+
+async def _save(items: list[dict]) -> None:
+    from .core.db import SessionLocal
+
+    async with SessionLocal() as session:
+        for it in items:
+            if it["content_hash"]:
+                await store_analysis(
+                    session,
+                    content_hash=it["content_hash"],
+                    version=it["version"],
+                    duration=it["duration"],
+                    transcript=it["transcript"],
+                    silence=it["silence"],
+                )
+        if len(items) == 1:
+            it = items[0]
             await mark_ready(
                 session,
-                call_id=uuid.UUID(call_id),
-                duration=dur,
-                transcript=transcript,
-                silence=silence,
+                call_id=it["call_id"],
+                duration=it["duration"],
+                transcript=it["transcript"],
+                silence=it["silence"],
             )
+        else:
+            await mark_ready_many(session, items)
+
+
+async def _enqueue_ready(item: dict) -> None:
+    blob = encode_marks(item["silence"])
+    payload = {**item, "call_id": str(item["call_id"]), "silence": None if blob is None else blob.hex()}
+    queued = await get_redis().rpush(READY_QUEUE_KEY, json.dumps(payload))
+    if queued >= settings.READY_BATCH_SIZE:
+        await _flush_ready()
+
+
+async def _flush_ready() -> int:
+    client = get_redis()
+    flushed = 0
+    # Items put back for a retry go to the tail: drain only what is queued now
+    left = await client.llen(READY_QUEUE_KEY)
+    while left > 0:
+        raw = await client.lpop(READY_QUEUE_KEY, min(left, settings.READY_BATCH_SIZE))
+        if not raw:
+            break
+        left -= len(raw)
+        payloads = [json.loads(r) for r in raw]
+        try:
+            await _save([_ready_item(p) for p in payloads])
+            flushed += len(payloads)
+        except Exception:
+            # One bad item must not hold back the rest: save them one by one
+            flushed += await _save_each(client, payloads)
+        except BaseException:
+            # Interrupted (worker shutdown): the next flush retries the batch
+            await client.rpush(READY_QUEUE_KEY, *raw)
+            raise
+    return flushed
+
+
+async def _save_each(client, payloads: list[dict]) -> int:
+    saved = 0
+    for payload in payloads:
+        try:
+            await _save([_ready_item(payload)])
+        except Exception:
+            attempts = payload.get("attempts", 0) + 1
+            dead = attempts >= settings.READY_BATCH_MAX_ATTEMPTS
+            log.exception("saving result of call %s failed (attempt %d)", payload["call_id"], attempts)
+            key = READY_DEAD_KEY if dead else READY_QUEUE_KEY
+            await client.rpush(key, json.dumps({**payload, "attempts": attempts}))
+        else:
+            saved += 1
+    return saved
+
+
+def _ready_item(payload: dict) -> dict:
+    item = {k: v for k, v in payload.items() if k != "attempts"}
+    item["call_id"] = uuid.UUID(item["call_id"])
+    if item["silence"] is not None:
+        item["silence"] = bytes.fromhex(item["silence"])
+    return item
+
+
+async def _relay_outbox() -> int:
+    from .core.celery_app import celery_app
+    from .core.db import SessionLocal
+
+    relayed = 0
+    async with SessionLocal() as session:
+        while True:
+            rows = await outbox.claim_batch(session, settings.OUTBOX_BATCH_SIZE)
+            if not rows:
+                break
+            try:
+                # One producer (and broker connection) for the whole batch
+                with celery_app.producer_or_acquire() as producer:
+                    for row in rows:
+                        celery_app.send_task(
+                            row["task"], args=row["args"], producer=producer, **row["options"]
+                        )
+            except BaseException:
+                # Rows stay pending; the next run publishes them again
+                await session.rollback()
+                raise
+            await session.commit()
+            now = datetime.now(timezone.utc)
+            for row in rows:
+                OUTBOX_LAG.observe((now - row["created_at"]).total_seconds())
+            relayed += len(rows)
+            if len(rows) < settings.OUTBOX_BATCH_SIZE:
+                break
+    return relayed
+
+
+async def _sweep_outbox() -> dict:
+    from .core.db import SessionLocal
+
+    async with SessionLocal() as session:
+        requeued = await outbox.requeue_stuck(session)
+        purged = await outbox.purge_done(session)
+    return {"requeued": requeued, "purged": purged}
+
+
+async def _maintain_partitions() -> dict:
+    from .core.db import SessionLocal
 
-    asyncio.run(_save())
+    async with SessionLocal() as session:
+        created = await partitions.ensure_partitions(session)
+        await partitions.detach_expired(session)
+        # Also picks up months detached by an earlier run that failed to archive
+        archived = [
+            await partitions.archive_partition(session, name, get_storage())
+            for name in await partitions.detached_partitions(session)
+        ]
+    return {"created": created, "archived": archived}
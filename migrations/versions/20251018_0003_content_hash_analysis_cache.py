@@ -0,0 +1,30 @@
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251018_0003"
+down_revision = "20250927_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("recording", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.create_index("ix_recording_content_hash", "recording", ["content_hash"])
+
+    op.create_table(
+        "analysiscache",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("analyzer_version", sa.String(length=64), nullable=False),
+        sa.Column("duration_sec", sa.Integer(), nullable=True),
+        sa.Column("transcription", sa.String(length=4000), nullable=True),
+        sa.Column("silence_marks", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("content_hash", "analyzer_version", name="pk_analysiscache"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analysiscache")
+    op.drop_index("ix_recording_content_hash", table_name="recording")
+    op.drop_column("recording", "content_hash")
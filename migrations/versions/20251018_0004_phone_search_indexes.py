@@ -0,0 +1,49 @@
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251018_0004"
+down_revision = "20251018_0003"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ("caller", "receiver")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for col in COLUMNS:
+        op.add_column(
+            "call",
+            sa.Column(
+                f"{col}_digits",
+                sa.String(length=32),
+                sa.Computed(f"regexp_replace({col}, '[^0-9]', '', 'g')", persisted=True),
+                nullable=False,
+            ),
+        )
+
+    # Build indexes without blocking writes on a large table
+    with op.get_context().autocommit_block():
+        for col in COLUMNS:
+            digits = f"{col}_digits"
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_call_{digits}_trgm "
+                f"ON call USING gin ({digits} gin_trgm_ops)"
+            )
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_call_{digits}_prefix "
+                f"ON call ({digits} text_pattern_ops)"
+            )
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_call_{digits}_suffix "
+                f"ON call (reverse({digits}) text_pattern_ops)"
+            )
+
+
+def downgrade() -> None:
+    for col in COLUMNS:
+        digits = f"{col}_digits"
+        for kind in ("trgm", "prefix", "suffix"):
+            op.execute(f"DROP INDEX IF EXISTS ix_call_{digits}_{kind}")
+        op.drop_column("call", digits)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+from alembic import op
+
+revision = "20251018_0005"
+down_revision = "20251018_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matches ORDER BY created_at DESC, id DESC used by keyset pagination
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_call_created_at_id "
+            "ON call (created_at DESC, id DESC)"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_call_created_at_id")
@@ -0,0 +1,48 @@
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251018_0006"
+down_revision = "20251018_0005"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("recording", "analysiscache")
+
+# JSON [{"start", "end"}, ...] -> big-endian int32 pairs (services/marks.py)
+_PACK = """
+UPDATE {table} SET silence_marks_packed = (
+    SELECT coalesce(string_agg(int4send((m->>'start')::int) || int4send((m->>'end')::int), ''::bytea ORDER BY n), ''::bytea)
+    FROM json_array_elements(silence_marks) WITH ORDINALITY AS t(m, n)
+)
+WHERE silence_marks IS NOT NULL AND json_typeof(silence_marks) = 'array'
+"""
+
+_UNPACK = """
+UPDATE {table} SET silence_marks_json = (
+    SELECT coalesce(json_agg(json_build_object(
+        'start', ('x' || encode(substring(silence_marks FROM i * 8 + 1 FOR 4), 'hex'))::bit(32)::int,
+        'end', ('x' || encode(substring(silence_marks FROM i * 8 + 5 FOR 4), 'hex'))::bit(32)::int
+    ) ORDER BY i), '[]'::json)
+    FROM generate_series(0, length(silence_marks) / 8 - 1) AS i
+)
+WHERE silence_marks IS NOT NULL
+"""
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.add_column(table, sa.Column("silence_marks_packed", sa.LargeBinary(), nullable=True))
+        op.execute(_PACK.format(table=table))
+        op.drop_column(table, "silence_marks")
+        op.alter_column(table, "silence_marks_packed", new_column_name="silence_marks")
+        # Packed ints do not compress; EXTERNAL skips pglz and keeps substring() cheap
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN silence_marks SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.add_column(table, sa.Column("silence_marks_json", sa.JSON(), nullable=True))
+        op.execute(_UNPACK.format(table=table))
+        op.drop_column(table, "silence_marks")
+        op.alter_column(table, "silence_marks_json", new_column_name="silence_marks")
@@ -0,0 +1,34 @@
+from __future__ import annotations
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20251018_0007"
+down_revision = "20251018_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("call_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("task", sa.String(length=128), nullable=False),
+        sa.Column("args", sa.JSON(), nullable=False),
+        sa.Column("options", sa.JSON(), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column("dispatched_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="pk_outbox"),
+    )
+    op.create_index("ix_outbox_call_id", "outbox", ["call_id"])
+    op.create_index(
+        "ix_outbox_pending", "outbox", ["id"], postgresql_where=sa.text("dispatched_at IS NULL")
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("outbox")
@@ -0,0 +1,132 @@
+from __future__ import annotations
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20251018_0008"
+down_revision = "20251018_0007"
+branch_labels = None
+depends_on = None
+
+# Monthly partitions are created from the oldest call up to this many months
+# ahead; afterwards the beat task tasks.maintain_call_partitions keeps them coming
+_AHEAD = 3
+
+_COPY = (
+    "INSERT INTO {dst} (id, caller, receiver, started_at, status, created_at, updated_at) "
+    "SELECT id, caller, receiver, started_at, status, created_at, updated_at FROM {src}"
+)
+
+
+def _month(ts: datetime) -> datetime:
+    ts = ts.astimezone(timezone.utc)
+    return datetime(ts.year, ts.month, 1, tzinfo=timezone.utc)
+
+
+def _next(month: datetime) -> datetime:
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def _call_table(name: str, **kw) -> None:
+    op.create_table(
+        name,
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("caller", sa.String(length=32), nullable=False),
+        sa.Column("receiver", sa.String(length=32), nullable=False),
+        sa.Column(
+            "caller_digits",
+            sa.String(length=32),
+            sa.Computed("regexp_replace(caller, '[^0-9]', '', 'g')", persisted=True),
+            nullable=False,
+        ),
+        sa.Column(
+            "receiver_digits",
+            sa.String(length=32),
+            sa.Computed("regexp_replace(receiver, '[^0-9]', '', 'g')", persisted=True),
+            nullable=False,
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM("created", "processing", "ready", name="callstatus", create_type=False),
+            nullable=False,
+            server_default="created",
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        **kw,
+    )
+
+
+def _call_indexes() -> None:
+    # Same definitions as 20251018_0004/0005; on the parent they cascade to
+    # every partition (and to partitions created later)
+    op.execute("CREATE INDEX ix_call_created_at_id ON call (created_at DESC, id DESC)")
+    for col in ("caller", "receiver"):
+        digits = f"{col}_digits"
+        op.execute(f"CREATE INDEX ix_call_{digits}_trgm ON call USING gin ({digits} gin_trgm_ops)")
+        op.execute(f"CREATE INDEX ix_call_{digits}_prefix ON call ({digits} text_pattern_ops)")
+        op.execute(
+            f"CREATE INDEX ix_call_{digits}_suffix ON call (reverse({digits}) text_pattern_ops)"
+        )
+
+
+def _drop_recording_fk() -> None:
+    op.execute(
+        """
+        DO $$
+        DECLARE fk text;
+        BEGIN
+            FOR fk IN SELECT conname FROM pg_constraint
+                      WHERE conrelid = 'recording'::regclass AND contype = 'f'
+                        AND confrelid = 'call'::regclass
+            LOOP
+                EXECUTE format('ALTER TABLE recording DROP CONSTRAINT %I', fk);
+            END LOOP;
+        END $$
+        """
+    )
+
+
+def upgrade() -> None:
+    # A foreign key to a partitioned table must include the partition key:
+    # recording.call_id becomes a plain (still unique) column
+    _drop_recording_fk()
+    op.rename_table("call", "call_unpartitioned")
+
+    # Rewrites the table once; on a large database run it in a maintenance window
+    _call_table("call", postgresql_partition_by="RANGE (started_at)")
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text("SELECT min(started_at) FROM call_unpartitioned")).scalar()
+    now = datetime.now(timezone.utc)
+    month, last = _month(oldest or now), _month(now)
+    for _ in range(_AHEAD):
+        last = _next(last)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE call_y{month.year:04d}m{month.month:02d} PARTITION OF call "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next(month).isoformat()}')"
+        )
+        month = _next(month)
+    # Rows outside every monthly range (far past/future) land here
+    op.execute("CREATE TABLE call_default PARTITION OF call DEFAULT")
+
+    op.execute(_COPY.format(dst="call", src="call_unpartitioned"))
+    op.drop_table("call_unpartitioned")
+    op.create_primary_key("pk_call", "call", ["id", "started_at"])
+    _call_indexes()
+
+
+def downgrade() -> None:
+    # Calls of archived (dropped) partitions are not restored
+    op.rename_table("call", "call_partitioned")
+    _call_table("call")
+    op.execute(_COPY.format(dst="call", src="call_partitioned"))
+    op.drop_table("call_partitioned")  # drops every attached partition too
+    op.create_primary_key("pk_call", "call", ["id"])
+    _call_indexes()
+    op.execute("DELETE FROM recording WHERE call_id NOT IN (SELECT id FROM call)")
+    op.create_foreign_key(
+        "fk_recording_call_id_call", "recording", "call", ["call_id"], ["id"], ondelete="CASCADE"
+    )
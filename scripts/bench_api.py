@@ -0,0 +1,172 @@
+"""Load test: API throughput and latency percentiles per scenario.
+
+Runs each scenario against a live API (``BASE_URL``) with ``--concurrency``
+workers sharing a request budget, and prints one JSON line per scenario
+with requests/s, p50/p95/p99 latency and error counts, e.g.
+
+    BASE_URL=http://localhost:8000 python scripts/bench_api.py \
+        --scenarios create,get,search,upload --concurrency 32 --requests 2000
+
+Scenarios: ``create`` (POST /calls/), ``get`` (GET /calls/{id} over seeded
+calls, mostly cache hits), ``search`` (GET /calls/?query=...), ``upload``
+(create + POST /calls/{id}/recording with a short WAV).
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from bench_common import Reporter, add_common_args, fail, gen_wav_bytes, percentiles
+
+try:
+    import httpx
+except ImportError:
+    fail("'httpx' not installed. Install with: pip install httpx")
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8000")
+PREFIX = "+7900"  # every generated number starts with it, so search always has hits
+
+
+def phone() -> str:
+    return f"{PREFIX}{random.randrange(10**7):07d}"
+
+
+def call_payload() -> dict:
+    return {
+        "caller": phone(),
+        "receiver": phone(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+class Scenario:
+    def __init__(self, client: httpx.AsyncClient, args) -> None:
+        self.client = client
+        self.args = args
+        self.ids: list[str] = []
+        self.wav = gen_wav_bytes(args.upload_sec, rate=8000)
+
+    async def setup(self, name: str) -> None:
+        if name == "get" and not self.ids:
+            for _ in range(self.args.seed):
+                r = await self.client.post("/calls/", json=call_payload())
+                r.raise_for_status()
+                self.ids.append(r.json()["id"])
+
+    async def create(self) -> int:
+        r = await self.client.post("/calls/", json=call_payload())
+        return r.status_code
+
+    async def get(self) -> int:
+        r = await self.client.get(f"/calls/{random.choice(self.ids)}")
+        return r.status_code
+
+    async def search(self) -> int:
+        query = PREFIX[1:] + str(random.randrange(10, 100))
+        params = {"query": query, "limit": self.args.page_size, "total": self.args.total}
+        r = await self.client.get("/calls/", params=params)
+        return r.status_code
+
+    async def upload(self) -> int:
+        r = await self.client.post("/calls/", json=call_payload())
+        if r.status_code != 201:
+            return r.status_code
+        files = {"file": ("bench.wav", self.wav, "audio/wav")}
+        r = await self.client.post(f"/calls/{r.json()['id']}/recording", files=files)
+        return r.status_code
+
+
+async def run(op: Callable[[], Awaitable[int]], requests: int, concurrency: int,
+              duration: float | None) -> tuple[list[float], Counter, float]:
+    latencies: list[float] = []
+    errors: Counter = Counter()
+    remaining = requests
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker() -> None:
+        nonlocal remaining
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    return
+            elif remaining <= 0:
+                return
+            remaining -= 1
+            t0 = time.perf_counter()
+            try:
+                code = await op()
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] += 1
+                continue
+            if code >= 400:
+                errors[str(code)] += 1
+            else:
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - t0
+
+
+async def main_async(args) -> int:
+    n = args.concurrency
+    limits = httpx.Limits(max_connections=n, max_keepalive_connections=n)
+    report = Reporter(args.out)
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits, timeout=args.timeout) as client:
+        scenario = Scenario(client, args)
+        for name in args.scenarios.split(","):
+            op = getattr(scenario, name, None)
+            if name not in ("create", "get", "search", "upload") or op is None:
+                fail(f"unknown scenario: {name}")
+            await scenario.setup(name)
+            if args.warmup:
+                await run(op, args.warmup, args.concurrency, None)
+            latencies, errors, elapsed = await run(
+                op, args.requests, args.concurrency, args.duration
+            )
+            pct = percentiles(latencies)
+            report.emit(
+                "api",
+                f"{name}/c{args.concurrency}",
+                scenario=name,
+                concurrency=args.concurrency,
+                ok=len(latencies),
+                errors=dict(errors),
+                elapsed_sec=round(elapsed, 3),
+                value=round(len(latencies) / max(elapsed, 1e-9), 1),
+                unit="req/s",
+                better="higher",
+                p50_ms=pct["p50"],
+                p95_ms=pct["p95"],
+                p99_ms=pct["p99"],
+            )
+    report.close()
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scenarios", default="create,get,search,upload")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--requests", type=int, default=1000, help="per scenario")
+    ap.add_argument("--duration", type=float, default=None,
+                    help="seconds per scenario; overrides --requests")
+    ap.add_argument("--warmup", type=int, default=50)
+    ap.add_argument("--seed", type=int, default=200, help="calls created up front for 'get'")
+    ap.add_argument("--page-size", type=int, default=50)
+    ap.add_argument("--total", default="estimate", choices=["exact", "estimate", "none"])
+    ap.add_argument("--upload-sec", type=float, default=5.0)
+    ap.add_argument("--timeout", type=float, default=30.0)
+    add_common_args(ap)
+    args = ap.parse_args()
+    print(f"[INFO] Using BASE_URL={BASE_URL}", file=sys.stderr)
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
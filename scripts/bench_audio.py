@@ -0,0 +1,116 @@
+"""Benchmark: audio pipeline stages over several recording lengths and formats.
+
+Times header probe, in-memory analysis (pydub), streaming analysis, the
+segmented (parallel) analysis path and peak building on synthetic
+recordings. MP3 cases need ffmpeg and are skipped without it. Prints one
+JSON line per (op, format, length), e.g.
+
+    python scripts/bench_audio.py --minutes 1,10,60 --formats wav,mp3 --out bench.jsonl
+"""
+import argparse
+import io
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_common import Reporter, add_common_args, gen_wav_bytes  # noqa: E402
+from pydub import AudioSegment  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services import parallel  # noqa: E402
+from app.services.audio import analyze_file  # noqa: E402
+from app.services.audio_stream import analyze_stream  # noqa: E402
+from app.services.peaks import build_peaks  # noqa: E402
+from app.services.probe import probe  # noqa: E402
+
+
+def run_parallel(path: Path) -> None:
+    """Segments analysed one after another in-process (total CPU, not wall time)."""
+    ranges = parallel.plan_segments(path)
+    if ranges is None:
+        analyze_stream(path)
+        return
+    parallel.merge_segments([parallel.analyze_segment(path, s, e) for s, e in ranges])
+
+
+OPS = {
+    "probe": lambda p: probe(p, decode_fallback=False),
+    "analyze_file": analyze_file,
+    "analyze_stream": analyze_stream,
+    "parallel": run_parallel,
+    "peaks": build_peaks,
+}
+
+
+def write_sample(tmp: Path, minutes: float, fmt: str, rate: int, channels: int) -> Path | None:
+    wav = gen_wav_bytes(minutes * 60, rate, channels)
+    path = tmp / f"{minutes:g}min.{fmt}"
+    if fmt == "wav":
+        path.write_bytes(wav)
+    elif fmt == "mp3":
+        if not shutil.which("ffmpeg"):
+            return None
+        AudioSegment.from_file(io.BytesIO(wav), format="wav").export(path, format="mp3")
+    else:
+        raise SystemExit(f"unknown format: {fmt}")
+    return path
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--minutes", default="1,10,60", help="comma-separated recording lengths")
+    ap.add_argument("--formats", default="wav,mp3")
+    ap.add_argument("--ops", default=",".join(OPS))
+    ap.add_argument("--rate", type=int, default=16000)
+    ap.add_argument("--channels", type=int, default=1)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--max-memory-minutes", type=float, default=60.0,
+                    help="skip analyze_file (whole file in RAM) above this length")
+    add_common_args(ap)
+    args = ap.parse_args()
+
+    # Segment every recording so the parallel path is exercised at every length
+    settings.PARALLEL_ANALYSIS = True
+    settings.PARALLEL_MIN_SEC = 0
+    report = Reporter(args.out)
+    ops = [o for o in args.ops.split(",") if o]
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in (float(m) for m in args.minutes.split(",")):
+            for fmt in args.formats.split(","):
+                path = write_sample(Path(tmp), minutes, fmt, args.rate, args.channels)
+                if path is None:
+                    print(f"[SKIP] {fmt}: ffmpeg not found", file=sys.stderr)
+                    continue
+                for op in ops:
+                    if op == "analyze_file" and minutes > args.max_memory_minutes:
+                        continue
+                    times = []
+                    for _ in range(args.repeat):
+                        t0 = time.perf_counter()
+                        OPS[op](path)
+                        times.append(time.perf_counter() - t0)
+                    best = min(times)
+                    report.emit(
+                        "audio",
+                        f"{op}/{fmt}/{minutes:g}min",
+                        op=op,
+                        format=fmt,
+                        audio_sec=minutes * 60,
+                        file_bytes=path.stat().st_size,
+                        value=round(best, 6),
+                        unit="s",
+                        better="lower",
+                        median_sec=round(statistics.median(times), 6),
+                        x_realtime=round(minutes * 60 / max(best, 1e-9), 1),
+                    )
+                path.unlink()
+    report.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Shared helpers for the bench_* scripts: synthetic audio, percentiles, JSONL output.
+
+Every result is one JSON object per line with a ``bench`` and ``name`` field
+(the comparison key used by ``bench_compare.py``) plus run metadata.
+"""
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import wave
+from datetime import datetime, timezone
+from typing import Iterable, Sequence
+
+import numpy as np
+
+
+def gen_wav_bytes(seconds: float, rate: int = 16000, channels: int = 1) -> bytes:
+    """3 s tone bursts followed by 2 s of silence, 16-bit PCM (vectorized)."""
+    n = int(seconds * rate)
+    t = np.arange(n, dtype=np.float32) / rate
+    pcm = (0.5 * np.sin(2 * np.pi * 440.0 * t) * ((t % 5.0) < 3.0) * 32767).astype(np.int16)
+    if channels > 1:
+        pcm = np.repeat(pcm, channels)
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def percentiles(samples: Sequence[float], points: Iterable[int] = (50, 95, 99)) -> dict:
+    if not samples:
+        return {f"p{p}": None for p in points}
+    arr = np.asarray(samples, dtype=np.float64)
+    return {f"p{p}": round(float(np.percentile(arr, p)), 3) for p in points}
+
+
+def run_meta() -> dict:
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        rev = None
+    return {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": rev,
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+    }
+
+
+class Reporter:
+    """Print results as JSON lines; optionally append them to ``path`` too."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.meta = run_meta()
+        self.out = open(path, "a", encoding="utf-8") if path else None
+
+    def emit(self, bench: str, name: str, **fields) -> None:
+        line = json.dumps({"bench": bench, "name": name, **fields, **self.meta})
+        print(line, flush=True)
+        if self.out:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    def close(self) -> None:
+        if self.out:
+            self.out.close()
+
+
+def add_common_args(ap) -> None:
+    ap.add_argument("--out", help="append JSON lines to this file as well as stdout")
+
+
+def fail(msg: str) -> None:
+    print(f"[ERROR] {msg}", file=sys.stderr)
+    sys.exit(2)
@@ -0,0 +1,58 @@
+"""Compare two bench_*.py JSONL outputs and fail on regressions.
+
+Results are matched by (bench, name); the last line wins when a file holds
+several runs. ``value`` is compared in the direction given by ``better``.
+Exit code 1 when any result got worse by more than ``--threshold``, e.g.
+
+    python scripts/bench_compare.py baseline.jsonl current.jsonl --threshold 0.15
+"""
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    results = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            rec = json.loads(line)
+            if rec.get("value") is not None:
+                results[(rec["bench"], rec["name"])] = rec
+    return results
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("baseline")
+    ap.add_argument("current")
+    ap.add_argument("--threshold", type=float, default=0.1, help="allowed relative slowdown")
+    args = ap.parse_args()
+
+    base, cur = load(args.baseline), load(args.current)
+    regressions = 0
+    for key in sorted(base.keys() & cur.keys()):
+        old, new = base[key]["value"], cur[key]["value"]
+        higher = cur[key].get("better") == "higher"
+        change = (new - old) / old if old else 0.0
+        worse = -change if higher else change
+        flag = worse > args.threshold
+        regressions += flag
+        print(json.dumps({
+            "bench": key[0],
+            "name": key[1],
+            "unit": cur[key].get("unit"),
+            "baseline": old,
+            "current": new,
+            "change": round(change, 4),
+            "regression": flag,
+        }))
+    for key in sorted(base.keys() - cur.keys()):
+        print(f"[WARN] missing in current: {key[0]} {key[1]}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
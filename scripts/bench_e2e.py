@@ -0,0 +1,153 @@
+"""End-to-end benchmark: upload -> Celery -> ``ready``, time-to-ready percentiles.
+
+For each recording: create a call, subscribe to its status stream
+(``GET /calls/{id}/events``), upload a synthetic WAV and wait for the
+``ready`` event. Falls back to polling ``GET /calls/{id}`` when the API has
+no Redis (501). Needs the API and at least one worker running, e.g.
+
+    BASE_URL=http://localhost:8000 python scripts/bench_e2e.py --count 50 --seconds 30,600
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from bench_api import call_payload
+from bench_common import Reporter, add_common_args, fail, gen_wav_bytes, percentiles
+
+import httpx
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8000")
+
+
+async def wait_sse(client: httpx.AsyncClient, call_id: str, upload, timeout: float) -> str | None:
+    """Open the status stream, then upload; returns the final status or None on 501."""
+    async with client.stream("GET", f"/calls/{call_id}/events", timeout=timeout) as events:
+        if events.status_code == 501:
+            return None
+        events.raise_for_status()
+        lines = events.aiter_lines()
+        await upload()
+        async for line in lines:
+            if line.startswith("data:"):
+                status = json.loads(line[5:])["status"]
+                if status in ("ready", "failed"):
+                    return status
+    return "timeout"
+
+
+async def wait_poll(
+    client: httpx.AsyncClient, call_id: str, interval: float, deadline: float
+) -> str:
+    while time.perf_counter() < deadline:
+        r = await client.get(f"/calls/{call_id}")
+        status = r.json().get("status")
+        if status in ("ready", "failed"):
+            return status
+        await asyncio.sleep(interval)
+    return "timeout"
+
+
+async def one(
+    client: httpx.AsyncClient, wav: bytes, args, use_sse: list[bool]
+) -> tuple[str, float, float]:
+    r = await client.post("/calls/", json=call_payload())
+    r.raise_for_status()
+    call_id = r.json()["id"]
+    t0 = time.perf_counter()
+    upload_ms = 0.0
+
+    async def upload() -> None:
+        nonlocal upload_ms
+        files = {"file": ("bench.wav", wav, "audio/wav")}
+        up = await client.post(f"/calls/{call_id}/recording", files=files)
+        up.raise_for_status()
+        upload_ms = (time.perf_counter() - t0) * 1000
+
+    status = None
+    if use_sse[0]:
+        try:
+            waiting = wait_sse(client, call_id, upload, args.timeout)
+            status = await asyncio.wait_for(waiting, args.timeout)
+        except asyncio.TimeoutError:
+            status = "timeout"
+        if status is None:
+            use_sse[0] = False
+    if status is None:
+        await upload()
+        status = await wait_poll(client, call_id, args.poll_interval, t0 + args.timeout)
+    return status, upload_ms, time.perf_counter() - t0
+
+
+async def main_async(args) -> int:
+    report = Reporter(args.out)
+    use_sse = [not args.poll]
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits, timeout=args.timeout) as client:
+        for seconds in (float(s) for s in args.seconds.split(",")):
+            wav = gen_wav_bytes(seconds, rate=args.rate)
+            sem = asyncio.Semaphore(args.concurrency)
+
+            async def bounded():
+                async with sem:
+                    return await one(client, wav, args, use_sse)
+
+            t0 = time.perf_counter()
+            jobs = (bounded() for _ in range(args.count))
+            results = await asyncio.gather(*jobs, return_exceptions=True)
+            elapsed = time.perf_counter() - t0
+            outcomes: Counter = Counter()
+            ready, uploads = [], []
+            for res in results:
+                if isinstance(res, BaseException):
+                    outcomes[type(res).__name__] += 1
+                    continue
+                status, upload_ms, total = res
+                outcomes[status] += 1
+                if status == "ready":
+                    ready.append(total)
+                    uploads.append(upload_ms)
+            pct = percentiles(ready)
+            report.emit(
+                "e2e",
+                f"time_to_ready/{seconds:g}s/c{args.concurrency}",
+                audio_sec=seconds,
+                count=args.count,
+                concurrency=args.concurrency,
+                outcomes=dict(outcomes),
+                mode="sse" if use_sse[0] else "poll",
+                value=pct["p95"],
+                unit="s",
+                better="lower",
+                p50_sec=pct["p50"],
+                p95_sec=pct["p95"],
+                p99_sec=pct["p99"],
+                upload_p95_ms=percentiles(uploads)["p95"],
+                recordings_per_sec=round(len(ready) / max(elapsed, 1e-9), 2),
+            )
+    report.close()
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", default="30", help="comma-separated recording lengths")
+    ap.add_argument("--count", type=int, default=20, help="recordings per length")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--rate", type=int, default=16000)
+    ap.add_argument("--timeout", type=float, default=300.0, help="per recording")
+    ap.add_argument("--poll", action="store_true", help="poll GET /calls/{id} instead of SSE")
+    ap.add_argument("--poll-interval", type=float, default=0.2)
+    add_common_args(ap)
+    args = ap.parse_args()
+    if args.count < 1:
+        fail("--count must be positive")
+    print(f"[INFO] Using BASE_URL={BASE_URL}", file=sys.stderr)
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
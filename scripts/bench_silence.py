@@ -0,0 +1,49 @@
+"""Benchmark: vectorized silence detection vs. decode speed.
+
+Generates a synthetic WAV (tone bursts separated by silence), then times
+pydub decode and ``detect_silence`` on it. Prints one JSON line per run, e.g.
+
+    python scripts/bench_silence.py --minutes 60 --rate 16000
+"""
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_common import gen_wav_bytes  # noqa: E402
+from pydub import AudioSegment  # noqa: E402
+from app.services.silence import detect_silence, to_mono_float  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--minutes", type=float, default=60.0)
+    ap.add_argument("--rate", type=int, default=16000)
+    ap.add_argument("--channels", type=int, default=1)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    data = gen_wav_bytes(args.minutes * 60, args.rate, args.channels)
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        audio = AudioSegment.from_file(io.BytesIO(data), format="wav")
+        t1 = time.perf_counter()
+        marks = detect_silence(to_mono_float(audio), audio.frame_rate)
+        t2 = time.perf_counter()
+        print(json.dumps({
+            "audio_sec": round(audio.duration_seconds, 3),
+            "decode_sec": round(t1 - t0, 4),
+            "silence_sec": round(t2 - t1, 4),
+            "silence_x_realtime": round(audio.duration_seconds / max(t2 - t1, 1e-9), 1),
+            "silence_vs_decode": round((t2 - t1) / max(t1 - t0, 1e-9), 3),
+            "intervals": len(marks),
+        }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
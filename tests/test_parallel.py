@@ -0,0 +1,66 @@
+from __future__ import annotations
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services import parallel
+from app.services.audio_stream import analyze_stream, default_streaming_analyzers
+
+# (start, end) in seconds of the pauses; with PARALLEL_SEGMENT_SEC = 4 the
+# cuts fall just before 4, 8, 12 and 16 s, so pauses straddle or end near
+# segment boundaries. The first one is shorter than SILENCE_MIN_MS.
+PAUSES = [(1.0, 1.3), (3.2, 5.1), (7.6, 8.5), (11.0, 12.0), (15.4, 17.0)]
+DURATION = 17.0
+
+
+def _write_wav(path: Path, rate: int) -> None:
+    t = np.arange(int(DURATION * rate), dtype=np.float64) / rate
+    tone = 0.5 * np.sin(2 * np.pi * 440.0 * t)
+    for start, end in PAUSES:
+        tone[(t >= start) & (t < end)] = 0.0
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes((tone * 32767).astype(np.int16).tobytes())
+
+
+@pytest.fixture
+def parallel_settings(monkeypatch):
+    monkeypatch.setattr(settings, "PARALLEL_ANALYSIS", True)
+    monkeypatch.setattr(settings, "PARALLEL_MIN_SEC", 1.0)
+    monkeypatch.setattr(settings, "PARALLEL_SEGMENT_SEC", 4.0)
+
+
+@pytest.mark.parametrize("rate", [8000, 16000, 44100])
+def test_merged_segments_match_serial_pass(tmp_path, parallel_settings, rate):
+    path = tmp_path / "call.wav"
+    _write_wav(path, rate)
+
+    segments = parallel.plan_segments(path)
+    assert segments is not None and len(segments) == 5
+    # Boundaries sit on the silence frame grid
+    frame = parallel.frame_length(rate, settings.SILENCE_FRAME_MS)
+    assert all(start % frame == 0 for start, _ in segments)
+
+    merged = parallel.merge_segments(
+        [parallel.analyze_segment(path, start, end) for start, end in segments]
+    )
+    serial = analyze_stream(path, default_streaming_analyzers())
+
+    assert merged["duration"] == serial["duration"]
+    assert merged["silence"] == serial["silence"]
+    # Every pause long enough to count is found once, not split by a cut
+    min_sec = settings.SILENCE_MIN_MS / 1000
+    assert len(merged["silence"]) == sum(end - start >= min_sec for start, end in PAUSES)
+    assert merged["levels"] == pytest.approx(serial["levels"], abs=1e-6)
+
+
+def test_segments_in_any_order(tmp_path, parallel_settings):
+    path = tmp_path / "call.wav"
+    _write_wav(path, 8000)
+    parts = [parallel.analyze_segment(path, s, e) for s, e in parallel.plan_segments(path)]
+    assert parallel.merge_segments(parts[::-1]) == parallel.merge_segments(parts)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+import asyncio
+import io
+import os
+import time
+import uuid
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+requests = pytest.importorskip("requests")
+
+from app.api.routes.recordings import _is_direct_upload_key  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services.storage import S3Storage, content_key  # noqa: E402
+
+BUCKET = "calls-test"
+MIB = 1024 * 1024
+
+
+class AsyncBody:
+    """Minimal ``UploadFile`` stand-in: async ``read`` over bytes."""
+
+    def __init__(self, data: bytes) -> None:
+        self._f = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self._f.read(size)
+
+
+@pytest.fixture
+def s3(monkeypatch, tmp_path):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    # S3's minimum part size: a few MiB are enough to get several parts
+    monkeypatch.setattr(settings, "S3_PART_SIZE", 5 * MIB)
+    monkeypatch.setattr(settings, "S3_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(settings, "S3_CACHE_MAX_BYTES", 64 * MIB)
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield S3Storage(client=client, bucket=BUCKET)
+
+
+def _wav_bytes(size: int) -> bytes:
+    return b"RIFF" + os.urandom(size - 4)
+
+
+def test_stage_and_commit_uses_multipart(s3):
+    data = _wav_bytes(11 * MIB)
+    stored = asyncio.run(s3.stage_upload("call.wav", AsyncBody(data)))
+    assert stored.created
+    assert stored.key == content_key(stored.sha256, ".wav")
+    assert stored.path.exists()  # spooled locally for the probe
+
+    asyncio.run(s3.commit(stored))
+    assert not stored.path.exists()
+    head = s3.client.head_object(Bucket=BUCKET, Key=stored.key)
+    assert head["ContentLength"] == len(data)
+    assert head["ETag"].strip('"').endswith("-3")  # 5 + 5 + 1 MiB parts
+
+
+def test_stage_same_content_is_not_uploaded_again(s3):
+    data = _wav_bytes(MIB)
+    first = asyncio.run(s3.stage_upload("a.wav", AsyncBody(data)))
+    asyncio.run(s3.commit(first))
+    second = asyncio.run(s3.stage_upload("b.wav", AsyncBody(data)))
+    assert second.key == first.key
+    assert not second.created
+    asyncio.run(s3.discard(second))
+    assert not second.path.exists()
+
+
+def test_local_path_downloads_with_ranged_gets(s3):
+    data = os.urandom(11 * MIB + 123)
+    s3.client.put_object(Bucket=BUCKET, Key="objects/ab/blob.wav", Body=data)
+    with s3.local_path("objects/ab/blob.wav") as path:
+        assert path.read_bytes() == data
+        assert path.suffix == ".wav"
+    # Second use is served from the cache, the private link is gone
+    with s3.local_path("objects/ab/blob.wav") as path:
+        assert path.read_bytes() == data
+    blobs = s3.cache_dir / "blobs" / "objects" / "ab"
+    assert sorted(os.listdir(blobs)) == ["blob.wav"]
+
+
+def test_local_path_missing_object(s3):
+    with pytest.raises(FileNotFoundError):
+        with s3.local_path("objects/ab/missing.wav"):
+            pass
+
+
+def test_ranged_reader_seek_and_read(s3):
+    data = os.urandom(3 * MIB)
+    s3.client.put_object(Bucket=BUCKET, Key="k.bin", Body=data)
+    with s3.open("k.bin") as f:
+        assert f.read(10) == data[:10]
+        f.seek(2 * MIB)
+        assert f.read(100) == data[2 * MIB : 2 * MIB + 100]
+        f.seek(-50, io.SEEK_END)
+        assert f.read() == data[-50:]
+        assert f.read(10) == b""
+        f.seek(5)
+        assert f.tell() == 5
+        assert f.read(5) == data[5:10]
+
+
+def test_ranged_reader_missing_object(s3):
+    with pytest.raises(FileNotFoundError):
+        s3.open("nope.bin").read(1)
+
+
+def test_open_write_multipart(s3):
+    data = os.urandom(12 * MIB)
+    with s3.open_write("archive/x.tar.gz") as out:
+        for i in range(0, len(data), 700 * 1024):
+            out.write(data[i : i + 700 * 1024])
+    body = s3.client.get_object(Bucket=BUCKET, Key="archive/x.tar.gz")["Body"].read()
+    assert body == data
+
+
+def test_open_write_aborts_on_error(s3):
+    with pytest.raises(RuntimeError):
+        with s3.open_write("archive/broken.tar.gz") as out:
+            out.write(b"partial")
+            raise RuntimeError("boom")
+    assert not s3.exists("archive/broken.tar.gz")
+    assert not s3.client.list_multipart_uploads(Bucket=BUCKET).get("Uploads")
+
+
+def test_presign_put(s3):
+    url = s3.presign_put("incoming/x/y.wav", expires_in=120)
+    query = parse_qs(urlparse(url).query)
+    if "X-Amz-Expires" in query:  # SigV4
+        assert query["X-Amz-Expires"] == ["120"]
+    else:  # SigV2: absolute expiry
+        assert 0 < int(query["Expires"][0]) - time.time() <= 120
+    res = requests.put(url, data=b"RIFFdata")
+    assert res.status_code == 200
+    assert s3.size("incoming/x/y.wav") == 8
+
+
+def test_direct_upload_key_shape():
+    call_id = uuid.uuid4()
+    name = uuid.uuid4().hex
+    assert _is_direct_upload_key(f"incoming/{call_id}/{name}.wav", call_id)
+    assert _is_direct_upload_key(f"incoming/{call_id}/{name}.mp3", call_id)
+    rejected = [
+        f"incoming/{uuid.uuid4()}/{name}.wav",  # another call
+        f"incoming/{call_id}/{name}.exe",  # extension not allowed
+        f"incoming/{call_id}/{name.upper()}.wav",
+        f"incoming/{call_id}/{name[:-1]}.wav",
+        f"incoming/{call_id}/../{name}.wav",
+        f"incoming/{call_id}/sub/{name}.wav",
+        f"incoming/{call_id}/{name}.wav/x",
+        f"objects/{call_id}/{name}.wav",
+    ]
+    for key in rejected:
+        assert not _is_direct_upload_key(key, call_id), key